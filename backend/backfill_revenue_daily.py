@@ -0,0 +1,19 @@
+"""Rebuild the revenue_daily rollups behind /admin/revenue-analytics from all transactions.
+
+    python backfill_revenue_daily.py
+"""
+import asyncio
+
+from server import backfill_revenue_daily, client
+
+
+async def main():
+    try:
+        buckets = await backfill_revenue_daily()
+    finally:
+        client.close()
+    print(f"revenue_daily rebuilt: {buckets} buckets")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,19 @@
+"""Populate the /admin/users search fields on users created before they existed.
+
+    python backfill_user_search_fields.py
+"""
+import asyncio
+
+from server import backfill_user_search_fields, client
+
+
+async def main():
+    try:
+        updated = await backfill_user_search_fields()
+    finally:
+        client.close()
+    print(f"search fields backfilled: {updated} users")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
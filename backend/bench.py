@@ -0,0 +1,575 @@
+"""Before/after benchmarks for the API's hot paths, run against a local mongod.
+
+    python bench.py astrologer-stats --bookings 100000
+    python bench.py admin-stats --scale 0.1
+    python bench.py pagination --page 10000
+    python bench.py verify-storm --orders 200 --duplicates 20
+    python bench.py serialization --rows 1000
+    python bench.py login-burst --logins 500
+
+Benchmarks use their own database (BENCH_DB_NAME, default yoga_app_bench),
+never the DB_NAME the app is configured with. Each one seeds the fixture it
+needs on first use and reuses it while the size stays the same. Where the
+old code path can be reproduced it is timed next to the current one. The
+report is printed as JSON.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+os.environ["DB_NAME"] = os.environ.get("BENCH_DB_NAME", "yoga_app_bench")
+
+from loadtest import percentile  # noqa: E402
+from razorpay_stub import sign_payment  # noqa: E402
+from server import (  # noqa: E402
+    BCRYPT_ROUNDS,
+    BookingResponse,
+    TransactionRecord,
+    UserLogin,
+    VerifyPaymentRequest,
+    _admin_stats_from_counters,
+    _admin_stats_live,
+    KEYSET_SORT,
+    NO_OBJECT_ID,
+    bump_revenue_daily,
+    bump_stats_counters,
+    client,
+    credit_counters,
+    db,
+    encode_cursor,
+    ensure_indexes,
+    get_astrologer_stats,
+    get_user_transactions,
+    get_wallet_balance,
+    hash_password,
+    json_response,
+    login,
+    payment_gateway,
+    projection,
+    razorpay_key_secret,
+    serialize_doc,
+    verify_payment,
+    wallet_credit,
+)
+
+BENCH_ASTROLOGER = "Bench Astrologer"
+BENCH_USER = "bench-user"
+BOOKING_STATUSES = ["pending", "paid", "completed", "cancelled"]
+
+
+async def measure(call, repeat: int) -> dict:
+    """Latency summary of `repeat` awaited calls, after one warm-up call"""
+    await call()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await call()
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return {
+        "runs": repeat,
+        "min_ms": round(samples[0] * 1000, 2),
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 0.95) * 1000, 2),
+        "max_ms": round(samples[-1] * 1000, 2),
+    }
+
+
+def measure_cpu(call, repeat: int) -> dict:
+    """CPU time summary of `repeat` synchronous calls, after one warm-up call"""
+    call()
+    samples = []
+    for _ in range(repeat):
+        started = time.process_time()
+        call()
+        samples.append(time.process_time() - started)
+    samples.sort()
+    return {
+        "runs": repeat,
+        "cpu_p50_ms": round(percentile(samples, 0.50) * 1000, 3),
+        "cpu_p95_ms": round(percentile(samples, 0.95) * 1000, 3),
+    }
+
+
+def speedup(before: dict, after: dict, metric: str = "p50_ms") -> float:
+    return round(before[metric] / after[metric], 1) if after[metric] else None
+
+
+async def seed_fixture(name: str, size: int, seed) -> bool:
+    """Run `seed()` unless fixture `name` already exists at this size; True if it seeded"""
+    marker = await db.bench_fixtures.find_one({"_id": name})
+    if marker and marker.get("size") == size:
+        return False
+    await seed()
+    await db.bench_fixtures.replace_one({"_id": name}, {"_id": name, "size": size}, upsert=True)
+    return True
+
+
+async def insert_batches(collection, docs, batch_size: int = 5000):
+    batch = []
+    for doc in docs:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            await collection.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        await collection.insert_many(batch, ordered=False)
+
+
+async def seed_dataset(args):
+    """The seed_data.py dataset at --scale, shared by the benchmarks that need realistic data"""
+    async def seed():
+        subprocess.run(
+            [sys.executable, "seed_data.py", "--drop", "--rebuild", "--scale", str(args.scale), "--seed", str(args.seed)],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            check=True,
+        )
+        # --drop took every other fixture with it
+        await db.bench_fixtures.delete_many({})
+
+    await seed_fixture("dataset", args.scale, seed)
+
+
+def astrology_bookings(rng: random.Random, count: int, astrologer_name: str, days: int = 365):
+    now = datetime.utcnow()
+    for _ in range(count):
+        created_at = now - timedelta(seconds=rng.random() * days * 86400)
+        yield {
+            "id": str(uuid.uuid4()),
+            "user_id": str(uuid.uuid4()),
+            "astrologer_id": "bench-astrologer",
+            "astrologer_name": astrologer_name,
+            "astrologer_expertise": "Vedic",
+            "astrologer_experience": "10 years",
+            "astrologer_languages": "Hindi, English",
+            "service_name": "Kundli Reading",
+            "service_duration": "30 min",
+            "service_price": rng.choice([199.0, 499.0, 799.0]),
+            "booking_date": created_at.strftime("%Y-%m-%d"),
+            "booking_time": "10:00",
+            "status": rng.choice(BOOKING_STATUSES),
+            "created_at": created_at,
+        }
+
+
+async def legacy_astrologer_stats(name: str, cap):
+    """/astrologers/stats as it was: fetch the bookings, then walk them in Python"""
+    all_bookings = await db.bookings.find({"astrologer_name": name}).to_list(cap)
+    month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    week_start = datetime.utcnow() - timedelta(days=7)
+    this_month_bookings = [b for b in all_bookings if b.get("created_at", datetime.min) >= month_start]
+    await db.astrologers.find_one({"name": name})
+    return {
+        "total_bookings": len(all_bookings),
+        "completed_bookings": len([b for b in all_bookings if b.get("status") == "completed"]),
+        "pending_bookings": len([b for b in all_bookings if b.get("status") == "pending"]),
+        "cancelled_bookings": len([b for b in all_bookings if b.get("status") == "cancelled"]),
+        "total_earnings": sum(b.get("service_price", 0) for b in all_bookings if b.get("status") in ["paid", "completed"]),
+        "this_month_earnings": sum(
+            b.get("service_price", 0) for b in this_month_bookings if b.get("status") in ["paid", "completed"]
+        ),
+        "this_week_bookings": len([b for b in all_bookings if b.get("created_at", datetime.min) >= week_start]),
+    }
+
+
+async def bench_astrologer_stats(args) -> dict:
+    """One $group over an indexed astrologer_name against the old fetch-and-walk"""
+    async def seed():
+        await db.bookings.delete_many({"astrologer_name": BENCH_ASTROLOGER})
+        await insert_batches(db.bookings, astrology_bookings(random.Random(args.seed), args.bookings, BENCH_ASTROLOGER))
+
+    await seed_fixture("astrologer-stats", args.bookings, seed)
+    await db.astrologers.update_one(
+        {"name": BENCH_ASTROLOGER}, {"$set": {"rating": 4.7, "reviews": 1200}}, upsert=True
+    )
+
+    current = await get_astrologer_stats(BENCH_ASTROLOGER)
+    legacy = await legacy_astrologer_stats(BENCH_ASTROLOGER, 1000)
+    report = {
+        "bookings": args.bookings,
+        "current": await measure(lambda: get_astrologer_stats(BENCH_ASTROLOGER), args.repeat),
+        # As shipped: capped at 1000 documents, so its totals were wrong beyond that
+        "legacy_capped": await measure(lambda: legacy_astrologer_stats(BENCH_ASTROLOGER, 1000), args.repeat),
+        # What reading every booking into Python would cost for correct totals
+        "legacy_uncapped": await measure(lambda: legacy_astrologer_stats(BENCH_ASTROLOGER, None), args.repeat),
+        "total_bookings": {"current": current["total_bookings"], "legacy_capped": legacy["total_bookings"]},
+    }
+    report["speedup_vs_uncapped"] = speedup(report["legacy_uncapped"], report["current"])
+    return report
+
+
+async def legacy_admin_stats():
+    """/admin/stats as it was: eleven queries awaited one after another"""
+    month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    revenue = [{"$group": {"_id": None, "total_revenue": {"$sum": "$amount"}}}]
+    await db.users.count_documents({})
+    await db.users.count_documents({"created_at": {"$gte": datetime.utcnow().replace(day=1)}})
+    await db.bookings.count_documents({})
+    await db.bookings.count_documents({"status": "pending"})
+    await db.bookings.count_documents({"status": "paid"})
+    await db.yoga_bookings.count_documents({})
+    await db.yoga_purchases.count_documents({})
+    await db.yoga_consultations.count_documents({})
+    await db.transactions.aggregate([{"$match": {"type": "credit"}}, *revenue]).to_list(1)
+    await db.transactions.aggregate([
+        {"$match": {"type": "credit", "created_at": {"$gte": month_start}}}, *revenue
+    ]).to_list(1)
+    await db.users.aggregate([{"$group": {"_id": None, "total": {"$sum": "$wallet_balance"}}}]).to_list(1)
+
+
+async def bench_admin_stats(args) -> dict:
+    """/admin/stats: sequential queries, concurrent per-collection groups, and the counters document"""
+    await seed_dataset(args)
+    report = {
+        "documents": {name: await db[name].estimated_document_count() for name in (
+            "users", "bookings", "yoga_bookings", "yoga_purchases", "yoga_consultations", "transactions",
+        )},
+        "legacy_sequential": await measure(legacy_admin_stats, args.repeat),
+        "live_concurrent": await measure(_admin_stats_live, args.repeat),
+        "counters": await measure(_admin_stats_from_counters, args.repeat),
+    }
+    report["speedup_live"] = speedup(report["legacy_sequential"], report["live_concurrent"])
+    report["speedup_counters"] = speedup(report["legacy_sequential"], report["counters"])
+    return report
+
+
+def user_transactions(rng: random.Random, count: int, user_id: str):
+    started = datetime.utcnow() - timedelta(days=365)
+    balance = 0.0
+    for i in range(count):
+        credit = rng.random() < 0.4 or balance < 500
+        amount = rng.choice([500.0, 1000.0]) if credit else rng.choice([199.0, 499.0])
+        balance += amount if credit else -amount
+        yield {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "type": "credit" if credit else "debit",
+            "amount": amount,
+            "balance_after": balance,
+            "description": "Bench transaction",
+            "status": "completed",
+            "created_at": started + timedelta(seconds=i * 30),
+        }
+
+
+async def bench_pagination(args) -> dict:
+    """/wallet/{user_id}/transactions: page 1 against page N, by skip and by cursor"""
+    if args.page < 2:
+        raise SystemExit("--page must be at least 2")
+    rows = args.page * args.limit
+
+    async def seed():
+        await db.transactions.delete_many({"user_id": BENCH_USER})
+        await insert_batches(db.transactions, user_transactions(random.Random(args.seed), rows, BENCH_USER))
+
+    await seed_fixture("pagination", rows, seed)
+
+    # The cursor a client would hold after reading pages 1..N-1
+    skipped = (args.page - 1) * args.limit
+    last_of_previous = await db.transactions.find(
+        {"user_id": BENCH_USER}, NO_OBJECT_ID
+    ).sort(KEYSET_SORT).skip(skipped - 1).limit(1).to_list(1)
+    cursor = encode_cursor(last_of_previous[0])
+
+    async def skip_page(skip):
+        return await db.transactions.find(
+            {"user_id": BENCH_USER}, NO_OBJECT_ID
+        ).sort(KEYSET_SORT).skip(skip).limit(args.limit).to_list(args.limit)
+
+    report = {
+        "rows": rows,
+        "limit": args.limit,
+        "page": args.page,
+        "skip_page_1": await measure(lambda: skip_page(0), args.repeat),
+        "skip_page_n": await measure(lambda: skip_page(skipped), args.repeat),
+        "cursor_page_1": await measure(lambda: get_user_transactions(BENCH_USER, limit=args.limit, cursor=None), args.repeat),
+        "cursor_page_n": await measure(lambda: get_user_transactions(BENCH_USER, limit=args.limit, cursor=cursor), args.repeat),
+    }
+    report["skip_page_n_vs_page_1"] = speedup(report["skip_page_n"], report["skip_page_1"])
+    report["cursor_page_n_vs_page_1"] = speedup(report["cursor_page_n"], report["cursor_page_1"])
+    return report
+
+
+def latency_summary(samples: list) -> dict:
+    samples = sorted(samples)
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 2),
+        "max_ms": round(samples[-1] * 1000, 2) if samples else 0.0,
+    }
+
+
+async def legacy_verify_payment(request: VerifyPaymentRequest) -> dict:
+    """/payment/verify before its two rollup bumps were sent together: five sequential round trips"""
+    if not payment_gateway.verify_payment_signature(
+        request.razorpay_order_id, request.razorpay_payment_id, request.razorpay_signature
+    ):
+        raise HTTPException(status_code=400, detail="Invalid payment signature")
+    order = await db.payment_orders.find_one_and_update(
+        {"order_id": request.razorpay_order_id, "status": "created"},
+        {"$set": {"status": "completed", "payment_id": request.razorpay_payment_id, "completed_at": datetime.utcnow()}},
+        projection=projection("amount")
+    )
+    if not order:
+        await db.payment_orders.find_one({"order_id": request.razorpay_order_id}, projection("order_id"))
+        user = await db.users.find_one({"id": request.user_id}, projection("id", "wallet_balance"))
+        return {"success": True, "message": "Payment already processed", "new_balance": user.get("wallet_balance", 0)}
+    new_balance = await wallet_credit(request.user_id, order["amount"])
+    transaction = TransactionRecord(
+        user_id=request.user_id,
+        type="credit",
+        amount=order["amount"],
+        balance_after=new_balance,
+        description="Wallet recharge via Razorpay",
+        payment_id=request.razorpay_payment_id,
+        order_id=request.razorpay_order_id,
+    )
+    await db.transactions.insert_one(transaction.dict())
+    await bump_revenue_daily(transaction)
+    await bump_stats_counters(credit_counters(transaction))
+    return {"success": True, "new_balance": new_balance, "transaction_id": transaction.id}
+
+
+async def verify_storm(verify, args) -> dict:
+    """Verify fresh orders --duplicates times each, all at once, through `verify`"""
+    run_tag = uuid.uuid4().hex[:8]
+    user_ids = [f"bench-verify-{run_tag}-{i}" for i in range(args.orders)]
+    await db.users.insert_many([
+        {"id": user_id, "full_name": "Bench Verify", "wallet_balance": 0.0} for user_id in user_ids
+    ])
+    await db.payment_orders.insert_many([{
+        "order_id": f"order_{user_id}",
+        "user_id": user_id,
+        "amount": 1000.0,
+        "amount_paise": 100000,
+        "currency": "INR",
+        "purpose": "wallet_recharge",
+        "status": "created",
+        "created_at": datetime.utcnow(),
+    } for user_id in user_ids])
+
+    latencies = []
+    credited = 0
+
+    async def timed_verify(request):
+        nonlocal credited
+        started = time.perf_counter()
+        result = await verify(request)
+        latencies.append(time.perf_counter() - started)
+        credited += "transaction_id" in result
+
+    requests = []
+    for user_id in user_ids:
+        order_id, payment_id = f"order_{user_id}", f"pay_{user_id}"
+        request = VerifyPaymentRequest(
+            user_id=user_id,
+            razorpay_order_id=order_id,
+            razorpay_payment_id=payment_id,
+            razorpay_signature=sign_payment(razorpay_key_secret, order_id, payment_id),
+            amount=1000.0,
+        )
+        requests.extend([request] * args.duplicates)
+    random.Random(args.seed).shuffle(requests)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(timed_verify(request) for request in requests))
+    elapsed = time.perf_counter() - started
+
+    balances = await db.users.aggregate([
+        {"$match": {"id": {"$in": user_ids}}},
+        {"$group": {"_id": None, "total": {"$sum": "$wallet_balance"}}},
+    ]).to_list(1)
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "verifies_per_s": round(len(requests) / elapsed, 1),
+        **latency_summary(latencies),
+        # One credit per order whatever the retries: orders, orders, and orders * 1000
+        "credited": credited,
+        "transaction_rows": await db.transactions.count_documents({"user_id": {"$in": user_ids}}),
+        "wallet_total": balances[0]["total"] if balances else 0,
+    }
+
+
+async def bench_verify_storm(args) -> dict:
+    """/payment/verify under retry storms: every order verified --duplicates times at once"""
+    report = {
+        "orders": args.orders,
+        "duplicates_per_order": args.duplicates,
+        "verify_calls": args.orders * args.duplicates,
+        "sequential_rollups": await verify_storm(legacy_verify_payment, args),
+        "current": await verify_storm(verify_payment, args),
+    }
+    report["speedup"] = speedup(report["sequential_rollups"], report["current"])
+    return report
+
+
+def legacy_bookings_response(docs: list) -> bytes:
+    """/bookings/user/{user_id} as it was: a BookingResponse per document, re-encoded with stdlib json"""
+    bookings = [BookingResponse(
+        id=b["id"],
+        user_id=b["user_id"],
+        astrologer_id=b["astrologer_id"],
+        astrologer_name=b["astrologer_name"],
+        astrologer_expertise=b["astrologer_expertise"],
+        astrologer_experience=b["astrologer_experience"],
+        astrologer_languages=b["astrologer_languages"],
+        service_name=b["service_name"],
+        service_duration=b["service_duration"],
+        service_price=b["service_price"],
+        booking_date=b["booking_date"],
+        booking_time=b["booking_time"],
+        status=b["status"],
+        created_at=b["created_at"],
+    ) for b in docs]
+    return JSONResponse(jsonable_encoder(bookings)).body
+
+
+def legacy_transactions_response(docs: list) -> bytes:
+    """/wallet/{user_id}/transactions as it was: serialize_doc copies, re-encoded with stdlib json"""
+    return JSONResponse(jsonable_encoder({"transactions": serialize_doc(docs), "next_cursor": None})).body
+
+
+async def bench_serialization(args) -> dict:
+    """Per-request CPU to serialize --rows bookings and transactions, old path against json_response.
+
+    The old path leaves out FastAPI's response_model validation pass, so its
+    numbers are a lower bound. Nothing is read from the database.
+    """
+    rng = random.Random(args.seed)
+    # What the old queries returned (with _id) and what NO_OBJECT_ID queries return now
+    bookings = list(astrology_bookings(rng, args.rows, BENCH_ASTROLOGER))
+    transactions = list(user_transactions(rng, args.rows, BENCH_USER))
+    legacy_bookings = [{"_id": ObjectId(), **doc} for doc in bookings]
+    legacy_transactions = [{"_id": ObjectId(), **doc} for doc in transactions]
+
+    report = {
+        "rows": args.rows,
+        "bookings_legacy": measure_cpu(lambda: legacy_bookings_response(legacy_bookings), args.repeat),
+        "bookings_current": measure_cpu(lambda: json_response(bookings).body, args.repeat),
+        "transactions_legacy": measure_cpu(lambda: legacy_transactions_response(legacy_transactions), args.repeat),
+        "transactions_current": measure_cpu(
+            lambda: json_response({"transactions": transactions, "next_cursor": None}).body, args.repeat
+        ),
+    }
+    report["speedup_bookings"] = speedup(report["bookings_legacy"], report["bookings_current"], "cpu_p50_ms")
+    report["speedup_transactions"] = speedup(
+        report["transactions_legacy"], report["transactions_current"], "cpu_p50_ms"
+    )
+    return report
+
+
+async def bench_login_burst(args) -> dict:
+    """--logins concurrent logins, and what they do to /wallet/{user_id} latency meanwhile"""
+    emails = [f"bench-login-{i}@example.com" for i in range(args.users)]
+
+    async def seed():
+        await db.users.delete_many({"email": {"$in": emails}})
+        password_hash = await hash_password("bench-password")
+        await db.users.insert_many([{
+            "id": f"bench-login-{i}",
+            "full_name": f"Bench Login {i}",
+            "email": email,
+            "phone": f"+9180000{i:05d}",
+            "password_hash": password_hash,
+            "wallet_balance": 1000.0,
+            "created_at": datetime.utcnow(),
+        } for i, email in enumerate(emails)])
+
+    await seed_fixture(f"login-burst-{BCRYPT_ROUNDS}", args.users, seed)
+
+    login_latencies = []
+    rejected = 0
+
+    async def timed_login(email):
+        nonlocal rejected
+        started = time.perf_counter()
+        try:
+            await login(UserLogin(email=email, password="bench-password"))
+        except HTTPException as e:
+            if e.status_code != 503:
+                raise
+            rejected += 1
+            return
+        login_latencies.append(time.perf_counter() - started)
+
+    burst = asyncio.ensure_future(asyncio.gather(*(
+        timed_login(emails[i % len(emails)]) for i in range(args.logins)
+    )))
+    wallet_latencies = []
+    while not burst.done():
+        started = time.perf_counter()
+        await get_wallet_balance("bench-login-0")
+        wallet_latencies.append(time.perf_counter() - started)
+    await burst
+
+    return {
+        "bcrypt_rounds": BCRYPT_ROUNDS,
+        "logins": args.logins,
+        "rejected_busy": rejected,
+        "login": latency_summary(login_latencies),
+        "wallet_idle": await measure(lambda: get_wallet_balance("bench-login-0"), args.repeat),
+        "wallet_during_burst": latency_summary(wallet_latencies),
+    }
+
+
+BENCHMARKS = {
+    "astrologer-stats": bench_astrologer_stats,
+    "admin-stats": bench_admin_stats,
+    "pagination": bench_pagination,
+    "verify-storm": bench_verify_storm,
+    "serialization": bench_serialization,
+    "login-burst": bench_login_burst,
+}
+
+
+async def main(args):
+    try:
+        await ensure_indexes()
+        report = await BENCHMARKS[args.benchmark](args)
+    finally:
+        client.close()
+    print(json.dumps({"benchmark": args.benchmark, **report}, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="timed runs per variant")
+    parser.add_argument("--seed", type=int, default=1)
+    benchmarks = parser.add_subparsers(dest="benchmark", required=True)
+
+    astrologer_stats = benchmarks.add_parser("astrologer-stats", help="/astrologers/stats, one astrologer")
+    astrologer_stats.add_argument("--bookings", type=int, default=100_000, help="bookings for the astrologer")
+
+    admin_stats = benchmarks.add_parser("admin-stats", help="/admin/stats over the seed_data.py dataset")
+    admin_stats.add_argument("--scale", type=float, default=0.1, help="seed_data.py --scale")
+
+    pagination = benchmarks.add_parser("pagination", help="deep pages of one user's transactions")
+    pagination.add_argument("--page", type=int, default=10_000, help="page to compare with page 1")
+    pagination.add_argument("--limit", type=int, default=50, help="page size")
+
+    verify_storm = benchmarks.add_parser("verify-storm", help="/payment/verify with concurrent duplicate retries")
+    verify_storm.add_argument("--orders", type=int, default=200, help="payment orders to verify")
+    verify_storm.add_argument("--duplicates", type=int, default=20, help="concurrent verify calls per order")
+
+    serialization = benchmarks.add_parser("serialization", help="list response encoding, CPU per request")
+    serialization.add_argument("--rows", type=int, default=1000, help="rows per list")
+
+    login_burst = benchmarks.add_parser("login-burst", help="concurrent logins and other routes' latency meanwhile")
+    login_burst.add_argument("--logins", type=int, default=500, help="logins started at once")
+    login_burst.add_argument("--users", type=int, default=100, help="accounts the logins are spread over")
+
+    asyncio.run(main(parser.parse_args()))
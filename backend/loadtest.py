@@ -0,0 +1,427 @@
+"""Async load generator for the API, reporting throughput and latency percentiles per route.
+
+Start the API against a local mongod with the gateway pointed at the stub,
+or pass --spawn to have this script start both:
+
+    uvicorn razorpay_stub:app --port 9001
+    RAZORPAY_API_URL=http://localhost:9001/v1 uvicorn server:app --port 8001
+    python loadtest.py --users 50 --duration 60 --output run.json
+    python loadtest.py --users 50 --duration 60 --baseline run.json
+
+Each virtual user signs up, tops up its wallet through create-order/verify and
+then loops over a weighted mix of scenarios. The scenario sequence is driven by
+--seed, so two runs with the same arguments issue the same requests. Emails
+and phone numbers are built from a random per-run tag instead, so repeated
+runs against the same database do not collide on the unique signup fields.
+RAZORPAY_KEY_SECRET must match the server's so that payment signatures verify.
+
+With --sse-subscribers N, N idle /admin/events streams are opened before the
+load starts. The server's resident memory (process_resident_memory_bytes on
+/metrics) is read before they connect and once all of them have, and the
+report's "sse" section gives the difference per subscriber:
+
+    python loadtest.py --users 0 --duration 10 --sse-subscribers 500
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+
+import httpx
+
+from razorpay_stub import sign_payment
+
+SCENARIO_WEIGHTS = {
+    "signup_login": 1,
+    "astrology_booking": 4,
+    "yoga_booking": 4,
+    "wallet_recharge": 1,
+    "user_reads": 6,
+}
+
+ASTROLOGERS = [
+    ("astro-1", "Pandit Sharma", "Vedic", "15 years", "Hindi, English"),
+    ("astro-2", "Acharya Iyer", "Tarot", "8 years", "Tamil, English"),
+    ("astro-3", "Guru Mehta", "Numerology", "20 years", "Gujarati, Hindi"),
+]
+SERVICES = [("Kundli Reading", "30 min", 499.0), ("Career Guidance", "45 min", 799.0), ("Quick Question", "15 min", 199.0)]
+YOGA_CLASSES = [("Hatha Flow", "Beginner"), ("Vinyasa", "Intermediate"), ("Ashtanga", "Advanced")]
+YOGA_PACKAGES = [("Starter Pack", 1499.0, 5), ("Monthly Unlimited", 3999.0, 20)]
+
+
+class Recorder:
+    """Latencies and failures per route label"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def request(self, http: httpx.AsyncClient, method: str, route: str, url: str, **kwargs):
+        label = f"{method} {route}"
+        started = time.perf_counter()
+        try:
+            response = await http.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.latencies[label].append(time.perf_counter() - started)
+            self.errors[label] += 1
+            return None
+        self.latencies[label].append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.errors[label] += 1
+            return None
+        return response.json()
+
+
+class VirtualUser:
+    def __init__(self, index: int, args, recorder: Recorder, http: httpx.AsyncClient, run_tag: str):
+        self.rng = random.Random(f"{args.seed}:{index}")
+        self.index = index
+        self.args = args
+        self.recorder = recorder
+        self.http = http
+        self.run_tag = run_tag
+        self.user_id = None
+        self.signups = 0
+
+    async def request(self, method, route, url=None, **kwargs):
+        return await self.recorder.request(self.http, method, route, url or route, **kwargs)
+
+    async def signup(self):
+        self.signups += 1
+        email = f"load-{self.run_tag}-{self.index}-{self.signups}@example.com"
+        phone = f"9{int(self.run_tag, 16):010d}{self.index:05d}{self.signups:04d}"
+        password = "load-test-password"
+        user = await self.request("POST", "/api/auth/signup", json={
+            "full_name": f"Load User {self.index}",
+            "email": email,
+            "phone": phone,
+            "password": password,
+            "gender": self.rng.choice(["male", "female"]),
+            "location": self.rng.choice(["Mumbai", "Delhi", "Pune", "Chennai"]),
+        })
+        await self.request("POST", "/api/auth/login", json={"email": email, "password": password})
+        return user
+
+    async def recharge(self, amount: float):
+        order = await self.request("POST", "/api/payment/create-order", json={
+            "user_id": self.user_id,
+            "amount": amount,
+        })
+        if not order:
+            return
+        payment_id = f"pay_{self.rng.getrandbits(56):014x}"
+        await self.request("POST", "/api/payment/verify", json={
+            "user_id": self.user_id,
+            "razorpay_order_id": order["order_id"],
+            "razorpay_payment_id": payment_id,
+            "razorpay_signature": sign_payment(self.args.key_secret, order["order_id"], payment_id),
+            "amount": amount,
+        })
+
+    async def deduct(self, amount: float, booking_id: str, booking_type: str):
+        await self.request("POST", "/api/wallet/deduct", json={
+            "user_id": self.user_id,
+            "amount": amount,
+            "booking_id": booking_id,
+            "booking_type": booking_type,
+            "description": f"Load test {booking_type} booking",
+        })
+
+    async def signup_login(self):
+        await self.signup()
+
+    async def astrology_booking(self):
+        astrologer_id, name, expertise, experience, languages = self.rng.choice(ASTROLOGERS)
+        service, duration, price = self.rng.choice(SERVICES)
+        booking = await self.request("POST", "/api/bookings", json={
+            "user_id": self.user_id,
+            "astrologer_id": astrologer_id,
+            "astrologer_name": name,
+            "astrologer_expertise": expertise,
+            "astrologer_experience": experience,
+            "astrologer_languages": languages,
+            "service_name": service,
+            "service_duration": duration,
+            "service_price": price,
+            "booking_date": f"2026-11-{self.rng.randint(1, 28):02d}",
+            "booking_time": f"{self.rng.randint(9, 20):02d}:00",
+        })
+        if booking:
+            await self.deduct(price, booking["id"], "astrology")
+
+    async def yoga_booking(self):
+        kind = self.rng.choice(["class", "package", "consultation"])
+        if kind == "class":
+            class_name, level = self.rng.choice(YOGA_CLASSES)
+            price = self.rng.choice([299.0, 399.0])
+            booking = await self.request("POST", "/api/yoga/class-booking", json={
+                "user_id": self.user_id,
+                "class_name": class_name,
+                "class_time": f"{self.rng.randint(6, 19):02d}:00",
+                "class_date": f"2026-11-{self.rng.randint(1, 28):02d}",
+                "guru_name": "Guru Anand",
+                "price": price,
+                "credits": 1,
+                "level": level,
+            })
+            if booking:
+                await self.deduct(price, booking["id"], "yoga_class")
+        elif kind == "package":
+            package_name, price, credits = self.rng.choice(YOGA_PACKAGES)
+            purchase = await self.request("POST", "/api/yoga/package-purchase", json={
+                "user_id": self.user_id,
+                "package_name": package_name,
+                "price": price,
+                "credits": credits,
+                "validity": "30 days",
+                "session_type": "Group class",
+            })
+            if purchase:
+                await self.deduct(price, purchase["id"], "yoga_package")
+        else:
+            await self.request("POST", "/api/yoga/consultation", json={
+                "user_id": self.user_id,
+                "yoga_goal": self.rng.choice(["Flexibility", "Stress relief", "Strength"]),
+                "intensity_preference": self.rng.choice(["Gentle", "Moderate", "Intense"]),
+                "connection_method": "Video call",
+                "schedule_timing": "Weekday mornings",
+            })
+
+    async def wallet_recharge(self):
+        await self.recharge(self.rng.choice([500.0, 1000.0, 2000.0]))
+
+    async def user_reads(self):
+        await self.request("GET", "/api/wallet/{user_id}", f"/api/wallet/{self.user_id}")
+        await self.request("GET", "/api/wallet/{user_id}/transactions", f"/api/wallet/{self.user_id}/transactions")
+        await self.request("GET", "/api/bookings/user/{user_id}", f"/api/bookings/user/{self.user_id}")
+        await self.request("GET", "/api/yoga/user/{user_id}/timeline", f"/api/yoga/user/{self.user_id}/timeline")
+
+    async def run(self, deadline: float):
+        user = await self.signup()
+        if not user:
+            return
+        self.user_id = user["id"]
+        await self.recharge(50000.0)
+        scenarios = list(SCENARIO_WEIGHTS)
+        weights = list(SCENARIO_WEIGHTS.values())
+        while time.monotonic() < deadline:
+            scenario = self.rng.choices(scenarios, weights)[0]
+            await getattr(self, scenario)()
+            if self.args.think_ms:
+                await asyncio.sleep(self.rng.expovariate(1000 / self.args.think_ms))
+
+
+async def poll_admin_dashboard(recorder: Recorder, http: httpx.AsyncClient, interval: float, deadline: float):
+    """What an open admin dashboard does: refresh every panel on a timer"""
+    while time.monotonic() < deadline:
+        await asyncio.gather(
+            recorder.request(http, "GET", "/api/admin/stats", "/api/admin/stats"),
+            recorder.request(http, "GET", "/api/admin/recent-activity", "/api/admin/recent-activity"),
+            recorder.request(http, "GET", "/api/admin/revenue-analytics", "/api/admin/revenue-analytics"),
+            recorder.request(http, "GET", "/api/admin/bookings/feed", "/api/admin/bookings/feed"),
+            recorder.request(http, "GET", "/api/admin/users", "/api/admin/users"),
+        )
+        await asyncio.sleep(interval)
+
+
+async def hold_event_stream(http: httpx.AsyncClient, stats: dict, connected: asyncio.Event):
+    """An idle SSE subscriber: keeps /admin/events open until cancelled and counts what it receives"""
+    try:
+        async with http.stream("GET", "/api/admin/events", timeout=None) as response:
+            if response.status_code != 200:
+                stats["sse_errors"] += 1
+                return
+            async for line in response.aiter_lines():
+                if line == ": connected":
+                    stats["sse_connected"] += 1
+                    connected.set()
+                elif line.startswith("data:"):
+                    stats["sse_events"] += 1
+    except httpx.HTTPError:
+        stats["sse_errors"] += 1
+    finally:
+        # A subscriber that failed must not keep main() waiting for it
+        connected.set()
+
+
+async def server_rss(http: httpx.AsyncClient):
+    """The server's resident memory in bytes, from its /metrics; None where it is not exported"""
+    response = await http.get("/metrics")
+    for line in response.text.splitlines():
+        if line.startswith("process_resident_memory_bytes "):
+            return float(line.split()[1])
+    return None
+
+
+async def open_event_streams(http: httpx.AsyncClient, count: int, stats: dict) -> list:
+    """Open `count` idle subscribers and report the server memory they hold on to"""
+    rss_before = await server_rss(http)
+    connected = [asyncio.Event() for _ in range(count)]
+    subscribers = [asyncio.ensure_future(hold_event_stream(http, stats, event)) for event in connected]
+    await asyncio.gather(*(event.wait() for event in connected))
+    rss_after = await server_rss(http)
+    if rss_before is not None and rss_after is not None:
+        stats["rss_before_mb"] = round(rss_before / 2 ** 20, 1)
+        stats["rss_with_subscribers_mb"] = round(rss_after / 2 ** 20, 1)
+        if stats["sse_connected"]:
+            stats["rss_per_subscriber_kb"] = round((rss_after - rss_before) / stats["sse_connected"] / 1024, 1)
+    return subscribers
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(fraction * len(sorted_values))
+    return sorted_values[max(0, rank - 1)]
+
+
+def build_report(recorder: Recorder, elapsed: float, args, sse_stats: dict) -> dict:
+    routes = {}
+    for label in sorted(recorder.latencies):
+        values = sorted(recorder.latencies[label])
+        routes[label] = {
+            "count": len(values),
+            "errors": recorder.errors[label],
+            "throughput_rps": round(len(values) / elapsed, 2),
+            "mean_ms": round(sum(values) / len(values) * 1000, 2),
+            "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(values, 0.95) * 1000, 2),
+            "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+        }
+    total = sum(route["count"] for route in routes.values())
+    return {
+        "config": {
+            "base_url": args.base_url,
+            "users": args.users,
+            "duration_s": args.duration,
+            "seed": args.seed,
+            "think_ms": args.think_ms,
+            "admin_pollers": args.admin_pollers,
+            "sse_subscribers": args.sse_subscribers,
+        },
+        "elapsed_s": round(elapsed, 2),
+        "total_requests": total,
+        "total_errors": sum(route["errors"] for route in routes.values()),
+        "throughput_rps": round(total / elapsed, 2),
+        "sse": sse_stats,
+        "routes": routes,
+    }
+
+
+def compare(report: dict, baseline: dict) -> dict:
+    """Relative change per route against a previous report (positive = slower / more)"""
+    def change(current, previous):
+        return round((current - previous) / previous * 100, 1) if previous else None
+
+    diff = {"throughput_rps_pct": change(report["throughput_rps"], baseline["throughput_rps"]), "routes": {}}
+    for label, current in report["routes"].items():
+        previous = baseline["routes"].get(label)
+        if not previous:
+            diff["routes"][label] = "new"
+            continue
+        diff["routes"][label] = {
+            f"{metric}_pct": change(current[metric], previous[metric])
+            for metric in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+        }
+    for label in baseline["routes"]:
+        if label not in report["routes"]:
+            diff["routes"][label] = "missing"
+    return diff
+
+
+def spawn_servers(args) -> list:
+    """Start razorpay_stub and server:app with uvicorn in the backend directory"""
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    api_port = httpx.URL(args.base_url).port or 80
+    env = {**os.environ, "RAZORPAY_API_URL": f"http://127.0.0.1:{args.stub_port}/v1"}
+    env.setdefault("RAZORPAY_KEY_SECRET", args.key_secret)
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "razorpay_stub:app", "--port", str(args.stub_port), "--log-level", "warning"],
+            cwd=backend_dir, env=env,
+        ),
+        subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "server:app", "--port", str(api_port), "--log-level", "warning"],
+            cwd=backend_dir, env=env,
+        ),
+    ]
+    return processes
+
+
+async def wait_until_ready(http: httpx.AsyncClient, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            response = await http.get("/api/")
+            if response.status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"API not reachable at {http.base_url}")
+        await asyncio.sleep(0.25)
+
+
+async def main(args) -> dict:
+    recorder = Recorder()
+    run_tag = uuid.uuid4().hex[:8]
+    sse_stats = {"sse_connected": 0, "sse_events": 0, "sse_errors": 0}
+    limits = httpx.Limits(max_connections=args.users + args.admin_pollers * 5 + args.sse_subscribers + 10)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as http:
+        await wait_until_ready(http)
+        # Subscribers connect before the load starts, so their memory is measured on an idle server
+        subscribers = await open_event_streams(http, args.sse_subscribers, sse_stats) if args.sse_subscribers else []
+        started = time.monotonic()
+        deadline = started + args.duration
+        tasks = [VirtualUser(i, args, recorder, http, run_tag).run(deadline) for i in range(args.users)]
+        tasks += [poll_admin_dashboard(recorder, http, args.admin_interval, deadline) for _ in range(args.admin_pollers)]
+        await asyncio.gather(*tasks)
+        elapsed = time.monotonic() - started
+        for subscriber in subscribers:
+            subscriber.cancel()
+        await asyncio.gather(*subscribers, return_exceptions=True)
+    return build_report(recorder, elapsed, args, sse_stats)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8001")
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--think-ms", type=float, default=0, help="mean pause between scenarios")
+    parser.add_argument("--admin-pollers", type=int, default=1, help="open admin dashboards")
+    parser.add_argument("--admin-interval", type=float, default=2.0, help="seconds between dashboard refreshes")
+    parser.add_argument("--sse-subscribers", type=int, default=0, help="idle /admin/events connections")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--key-secret", default=os.environ.get("RAZORPAY_KEY_SECRET", ""))
+    parser.add_argument("--spawn", action="store_true", help="start razorpay_stub and server:app first")
+    parser.add_argument("--stub-port", type=int, default=9001)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="previous JSON report to compare against")
+    args = parser.parse_args()
+
+    processes = spawn_servers(args) if args.spawn else []
+    try:
+        report = asyncio.run(main(args))
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["baseline_diff"] = compare(report, json.load(f))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
@@ -0,0 +1,50 @@
+"""Local stand-in for the Razorpay Orders API, for offline load testing.
+
+Run it next to the API and point the gateway at it:
+
+    uvicorn razorpay_stub:app --port 9001
+    RAZORPAY_API_URL=http://localhost:9001/v1 uvicorn server:app --port 8001
+
+Set STUB_LATENCY_MS to simulate gateway round-trip time. Use
+sign_payment() to produce a signature that /api/payment/verify accepts.
+"""
+from fastapi import FastAPI, Request
+import asyncio
+import hashlib
+import hmac
+import os
+import time
+import uuid
+
+app = FastAPI()
+
+STUB_LATENCY_MS = float(os.environ.get('STUB_LATENCY_MS', '50'))
+
+
+def sign_payment(key_secret: str, order_id: str, payment_id: str) -> str:
+    """Signature Razorpay checkout would hand back for this order/payment"""
+    return hmac.new(
+        key_secret.encode(),
+        f"{order_id}|{payment_id}".encode(),
+        hashlib.sha256,
+    ).hexdigest()
+
+
+@app.post("/v1/orders")
+async def create_order(request: Request):
+    data = await request.json()
+    if STUB_LATENCY_MS:
+        await asyncio.sleep(STUB_LATENCY_MS / 1000)
+    return {
+        "id": f"order_{uuid.uuid4().hex[:14]}",
+        "entity": "order",
+        "amount": data["amount"],
+        "amount_paid": 0,
+        "amount_due": data["amount"],
+        "currency": data.get("currency", "INR"),
+        "receipt": data.get("receipt"),
+        "status": "created",
+        "attempts": 0,
+        "notes": data.get("notes", {}),
+        "created_at": int(time.time()),
+    }
@@ -0,0 +1,25 @@
+"""Recompute the stats_counters document behind /admin/stats.
+
+    python rebuild_stats_counters.py            # report drift and repair it
+    python rebuild_stats_counters.py --dry-run  # report drift only
+"""
+import argparse
+import asyncio
+import json
+
+from server import client, rebuild_stats_counters
+
+
+async def main(dry_run: bool):
+    try:
+        result = await rebuild_stats_counters(apply=not dry_run)
+    finally:
+        client.close()
+    print(json.dumps(result, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="report drift without writing")
+    args = parser.parse_args()
+    asyncio.run(main(args.dry_run))
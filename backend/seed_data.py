@@ -0,0 +1,461 @@
+"""Bulk-generate realistic users, astrologers, bookings, payment orders and transactions.
+
+    python seed_data.py --scale 0.01               # ~100k documents
+    python seed_data.py --drop --rebuild           # ~10M documents, then rebuild rollups
+
+Everything is driven by --seed, so the same arguments produce the same data.
+Users and astrologers are picked with Zipf-like skew (--user-skew,
+--astrologer-skew), so a handful of astrologers and heavy users account for
+most bookings. Events are generated along a single timeline, so wallet
+balances, balance_after and booking statuses stay consistent. Bookings are
+only marked paid when the user's balance covers them, and every paid booking
+gets a debit transaction. Every seeded user can log in with --password.
+
+Documents are written with unordered insert_many batches, --parallel at a
+time. With --drop, the collections are emptied first and indexes are built
+once at the end instead of being maintained per insert.
+"""
+import argparse
+import asyncio
+import bisect
+import json
+import random
+import re
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+from pymongo.errors import BulkWriteError
+
+from server import (
+    backfill_revenue_daily,
+    client,
+    db,
+    ensure_indexes,
+    hash_password,
+    rebuild_stats_counters,
+    user_search_fields,
+)
+
+SEEDED_COLLECTIONS = [
+    "users", "astrologers", "bookings", "yoga_bookings", "yoga_purchases", "yoga_consultations",
+    "payment_orders", "transactions", "stats_counters", "revenue_daily",
+]
+ASTROLOGER_EMAIL_DOMAIN = "astro.seed.example.com"
+
+FIRST_NAMES = [
+    "Aarav", "Vivaan", "Aditya", "Arjun", "Sai", "Reyansh", "Krishna", "Ishaan", "Rohan", "Kabir",
+    "Ananya", "Diya", "Saanvi", "Aadhya", "Kavya", "Priya", "Meera", "Isha", "Riya", "Neha",
+    "Rahul", "Vikram", "Sanjay", "Pooja", "Lakshmi", "Deepak", "Sneha", "Amit", "Nisha", "Karan",
+]
+LAST_NAMES = [
+    "Sharma", "Verma", "Iyer", "Reddy", "Patel", "Mehta", "Gupta", "Nair", "Rao", "Singh",
+    "Kumar", "Joshi", "Das", "Menon", "Chopra", "Bose", "Pillai", "Kulkarni", "Desai", "Agarwal",
+]
+ASTROLOGER_TITLES = ["Pandit", "Acharya", "Guru", "Jyotishi"]
+CITIES = ["Mumbai", "Delhi", "Bengaluru", "Chennai", "Pune", "Kolkata", "Hyderabad", "Jaipur", "Ahmedabad", "Lucknow"]
+EMAIL_DOMAINS = ["gmail.com", "yahoo.co.in", "outlook.com", "rediffmail.com"]
+EXPERTISE = ["Vedic", "Tarot", "Numerology", "Palmistry", "Vastu", "KP System"]
+LANGUAGES = ["Hindi, English", "Tamil, English", "Telugu, Hindi", "Bengali, English", "Marathi, Hindi", "Gujarati, Hindi"]
+SERVICES = [
+    ("Kundli Reading", "30 min", 499.0), ("Career Guidance", "45 min", 799.0),
+    ("Marriage Compatibility", "60 min", 1199.0), ("Quick Question", "15 min", 199.0),
+]
+YOGA_CLASSES = [("Hatha Flow", "Beginner"), ("Vinyasa", "Intermediate"), ("Ashtanga", "Advanced"), ("Yin Yoga", "Beginner")]
+YOGA_GURUS = ["Guru Anand", "Guru Shanti", "Guru Dev", "Guru Lakshmi"]
+YOGA_PACKAGES = [("Starter Pack", 1499.0, 5, "30 days"), ("Monthly Unlimited", 3999.0, 20, "30 days"), ("Quarterly", 9999.0, 60, "90 days")]
+YOGA_GOALS = ["Flexibility", "Stress relief", "Strength", "Weight loss", "Back pain"]
+RECHARGE_AMOUNTS = [500.0, 1000.0, 2000.0, 5000.0, 10000.0]
+
+
+def zipf_cumulative_weights(n: int, skew: float) -> list:
+    """Cumulative weights where item i is picked proportionally to 1 / (i + 1) ** skew"""
+    total = 0.0
+    cumulative = []
+    for rank in range(1, n + 1):
+        total += 1.0 / rank ** skew
+        cumulative.append(total)
+    return cumulative
+
+
+class Seeder:
+    def __init__(self, args, password_hash: str):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.password_hash = password_hash
+        self.now = datetime.utcnow()
+        self.start = self.now - timedelta(days=args.days)
+
+        self.user_ids = [self.uuid() for _ in range(args.users)]
+        self.user_weights = zipf_cumulative_weights(args.users, args.user_skew)
+        self.balances = [0.0] * args.users
+        self.first_seen = [None] * args.users
+
+        self.astrologers = self.make_astrologers(args.astrologers)
+        self.astrologer_weights = zipf_cumulative_weights(len(self.astrologers), args.astrologer_skew)
+
+        self.buffers = defaultdict(list)
+        self.inserted = Counter()
+        self.failed = Counter()
+        self.write_errors = Counter()  # error message -> documents it rejected
+        self.errors = []  # exceptions that ended an insert task
+        self.semaphore = asyncio.Semaphore(args.parallel)
+        self.tasks = set()
+        self.progress_mark = 0
+
+    def uuid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def pick(self, cumulative: list) -> int:
+        return bisect.bisect(cumulative, self.rng.random() * cumulative[-1])
+
+    def pick_user(self, created_at: datetime) -> int:
+        index = self.pick(self.user_weights)
+        if self.first_seen[index] is None:
+            self.first_seen[index] = created_at
+        return index
+
+    def future_date(self, created_at: datetime) -> str:
+        return (created_at + timedelta(days=self.rng.randint(1, 21))).strftime("%Y-%m-%d")
+
+    def make_astrologers(self, count: int) -> list:
+        names = set()
+        astrologers = []
+        for i in range(count):
+            name = f"{self.rng.choice(ASTROLOGER_TITLES)} {self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+            if name in names:
+                name = f"{name} {i}"
+            names.add(name)
+            astrologers.append({
+                "id": self.uuid(),
+                "name": name,
+                "expertise": self.rng.choice(EXPERTISE),
+                "experience": f"{self.rng.randint(2, 30)} years",
+                "languages": self.rng.choice(LANGUAGES),
+                "rating": round(self.rng.uniform(3.5, 5.0), 1),
+                "reviews": self.rng.randint(0, 5000),
+                "created_at": self.start,
+            })
+        return astrologers
+
+    async def add(self, collection: str, doc: dict):
+        buffer = self.buffers[collection]
+        buffer.append(doc)
+        if len(buffer) >= self.args.batch_size:
+            await self.flush(collection)
+
+    async def flush(self, collection: str):
+        docs = self.buffers.pop(collection, None)
+        if not docs:
+            return
+        await self.semaphore.acquire()
+        task = asyncio.create_task(self.insert(collection, docs))
+        self.tasks.add(task)
+        task.add_done_callback(self.task_done)
+        # Let the new batch reach the driver before generating the next one
+        await asyncio.sleep(0)
+
+    def task_done(self, task: asyncio.Task):
+        self.tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            self.errors.append(task.exception())
+
+    async def insert(self, collection: str, docs: list):
+        try:
+            await db[collection].insert_many(docs, ordered=False)
+            self.inserted[collection] += len(docs)
+        except BulkWriteError as e:
+            # Unordered, so the rest of the batch was still written
+            self.inserted[collection] += e.details["nInserted"]
+            self.failed[collection] += len(e.details["writeErrors"])
+            for error in e.details["writeErrors"]:
+                self.write_errors[error["errmsg"].split(" dup key")[0]] += 1
+        finally:
+            self.semaphore.release()
+        total = sum(self.inserted.values())
+        if total - self.progress_mark >= 1_000_000:
+            self.progress_mark = total
+            print(f"{total:,} documents inserted", file=sys.stderr)
+
+    async def drain(self):
+        """Flush every buffer and wait for all inserts; re-raises the first insert that failed outright"""
+        for collection in list(self.buffers):
+            await self.flush(collection)
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        if self.errors:
+            raise self.errors[0]
+
+    async def debit(self, user: int, amount: float, created_at, booking_id: str, booking_type: str, description: str):
+        self.balances[user] -= amount
+        await self.add("transactions", {
+            "id": self.uuid(),
+            "user_id": self.user_ids[user],
+            "type": "debit",
+            "amount": amount,
+            "balance_after": round(self.balances[user], 2),
+            "description": description,
+            "payment_id": None,
+            "order_id": None,
+            "booking_id": booking_id,
+            "booking_type": booking_type,
+            "status": "completed",
+            "created_at": created_at,
+        })
+
+    async def settle(self, user: int, price: float, created_at, booking_id: str, booking_type: str, description: str) -> dict:
+        """Status fields for a new booking: paid from the wallet when the balance allows"""
+        if price and self.rng.random() < self.args.paid_ratio and self.balances[user] >= price:
+            await self.debit(user, price, created_at, booking_id, booking_type, description)
+            paid_at = created_at + timedelta(minutes=self.rng.randint(1, 30))
+            return {"status": self.rng.choice(["paid", "completed"]), "paid_at": paid_at}
+        return {"status": "pending" if self.rng.random() < 0.6 else "cancelled"}
+
+    async def payment_order(self, created_at: datetime):
+        user = self.pick_user(created_at)
+        amount = self.rng.choice(RECHARGE_AMOUNTS)
+        order = {
+            "order_id": f"order_{self.rng.getrandbits(56):014x}",
+            "user_id": self.user_ids[user],
+            "amount": amount,
+            "amount_paise": int(amount * 100),
+            "currency": "INR",
+            "purpose": "wallet_recharge",
+            "status": "created",
+            "created_at": created_at,
+        }
+        if self.rng.random() < 0.85:
+            payment_id = f"pay_{self.rng.getrandbits(56):014x}"
+            completed_at = created_at + timedelta(seconds=self.rng.randint(20, 600))
+            order.update(status="completed", payment_id=payment_id, completed_at=completed_at)
+            self.balances[user] += amount
+            await self.add("transactions", {
+                "id": self.uuid(),
+                "user_id": self.user_ids[user],
+                "type": "credit",
+                "amount": amount,
+                "balance_after": round(self.balances[user], 2),
+                "description": "Wallet recharge via Razorpay",
+                "payment_id": payment_id,
+                "order_id": order["order_id"],
+                "booking_id": None,
+                "booking_type": None,
+                "status": "completed",
+                "created_at": completed_at,
+            })
+        await self.add("payment_orders", order)
+
+    async def booking(self, created_at: datetime):
+        user = self.pick_user(created_at)
+        astrologer = self.astrologers[self.pick(self.astrologer_weights)]
+        service, duration, price = self.rng.choice(SERVICES)
+        booking_id = self.uuid()
+        booking = {
+            "id": booking_id,
+            "user_id": self.user_ids[user],
+            "astrologer_id": astrologer["id"],
+            "astrologer_name": astrologer["name"],
+            "astrologer_expertise": astrologer["expertise"],
+            "astrologer_experience": astrologer["experience"],
+            "astrologer_languages": astrologer["languages"],
+            "service_name": service,
+            "service_duration": duration,
+            "service_price": price,
+            "booking_date": self.future_date(created_at),
+            "booking_time": f"{self.rng.randint(9, 20):02d}:{self.rng.choice(['00', '30'])}",
+            "created_at": created_at,
+        }
+        booking.update(await self.settle(
+            user, price, created_at, booking_id, "astrology", f"{service} with {astrologer['name']}"
+        ))
+        await self.add("bookings", booking)
+
+    async def yoga_booking(self, created_at: datetime):
+        user = self.pick_user(created_at)
+        class_name, level = self.rng.choice(YOGA_CLASSES)
+        price = self.rng.choice([299.0, 399.0, 499.0])
+        booking_id = self.uuid()
+        booking = {
+            "id": booking_id,
+            "user_id": self.user_ids[user],
+            "booking_type": "yoga_class",
+            "class_name": class_name,
+            "class_time": f"{self.rng.randint(6, 19):02d}:00",
+            "class_date": self.future_date(created_at),
+            "guru_name": self.rng.choice(YOGA_GURUS),
+            "price": price,
+            "credits": 1,
+            "level": level,
+            "created_at": created_at,
+        }
+        booking.update(await self.settle(user, price, created_at, booking_id, "yoga_class", f"{class_name} class"))
+        await self.add("yoga_bookings", booking)
+
+    async def yoga_purchase(self, created_at: datetime):
+        user = self.pick_user(created_at)
+        package_name, price, credits, validity = self.rng.choice(YOGA_PACKAGES)
+        purchase_id = self.uuid()
+        purchase = {
+            "id": purchase_id,
+            "user_id": self.user_ids[user],
+            "purchase_type": "yoga_package",
+            "package_name": package_name,
+            "price": price,
+            "credits": credits,
+            "validity": validity,
+            "mode": self.rng.choice(["Online", "Offline"]),
+            "session_type": self.rng.choice(["Group class", "Private Session"]),
+            "created_at": created_at,
+        }
+        purchase.update(await self.settle(user, price, created_at, purchase_id, "yoga_package", f"{package_name} package"))
+        await self.add("yoga_purchases", purchase)
+
+    async def yoga_consultation(self, created_at: datetime):
+        user = self.pick_user(created_at)
+        await self.add("yoga_consultations", {
+            "id": self.uuid(),
+            "user_id": self.user_ids[user],
+            "booking_type": "yoga_consultation",
+            "yoga_goal": self.rng.choice(YOGA_GOALS),
+            "intensity_preference": self.rng.choice(["Gentle", "Moderate", "Intense"]),
+            "connection_method": self.rng.choice(["Video call", "Phone call", "WhatsApp"]),
+            "schedule_timing": self.rng.choice(["Weekday mornings", "Weekday evenings", "Weekends"]),
+            "context_notes": None,
+            "whatsapp_number": None,
+            "price": 0.0,
+            "status": self.rng.choice(["pending", "completed", "cancelled"]),
+            "created_at": created_at,
+        })
+
+    async def events(self):
+        """Interleave every event type along one timeline, in proportion to what is left of each"""
+        remaining = {
+            self.payment_order: self.args.payment_orders,
+            self.booking: self.args.bookings,
+            self.yoga_booking: self.args.yoga_bookings,
+            self.yoga_purchase: self.args.yoga_purchases,
+            self.yoga_consultation: self.args.yoga_consultations,
+        }
+        total = left = sum(remaining.values())
+        span = (self.now - self.start).total_seconds()
+        for step in range(total):
+            created_at = self.start + timedelta(seconds=span * step / total)
+            choice = self.rng.randrange(left)
+            for make, count in remaining.items():
+                if choice < count:
+                    break
+                choice -= count
+            remaining[make] -= 1
+            left -= 1
+            await make(created_at)
+
+    async def users(self):
+        span = (self.now - self.start).total_seconds()
+        for index, user_id in enumerate(self.user_ids):
+            first_seen = self.first_seen[index]
+            if first_seen is None:
+                created_at = self.start + timedelta(seconds=self.rng.random() * span)
+            else:
+                created_at = max(self.start, first_seen - timedelta(minutes=self.rng.randint(1, 7 * 24 * 60)))
+            first, last = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+            full_name = f"{first} {last}"
+            email = f"{first.lower()}.{last.lower()}{index}@{self.rng.choice(EMAIL_DOMAINS)}"
+            phone = f"+91{9000000000 + index}"
+            await self.add("users", {
+                "id": user_id,
+                "full_name": full_name,
+                "email": email,
+                "phone": phone,
+                "password_hash": self.password_hash,
+                "gender": self.rng.choice(["male", "female"]),
+                "date_of_birth": f"{self.rng.randint(1960, 2005)}-{self.rng.randint(1, 12):02d}-{self.rng.randint(1, 28):02d}",
+                "time_of_birth": f"{self.rng.randint(0, 23):02d}:{self.rng.randint(0, 59):02d}",
+                "location": self.rng.choice(CITIES),
+                "created_at": created_at,
+                "updated_at": created_at,
+                "is_verified": self.rng.random() < 0.3,
+                "wallet_balance": round(self.balances[index], 2),
+                **user_search_fields(full_name, email, phone),
+            })
+
+    async def astrologer_accounts(self):
+        for astrologer in self.astrologers:
+            await self.add("astrologers", astrologer)
+            local_part = astrologer["name"].lower().replace(" ", ".")
+            await self.add("admins", {
+                "id": self.uuid(),
+                "fullName": astrologer["name"],
+                "email": f"{local_part}@{ASTROLOGER_EMAIL_DOMAIN}",
+                "password_hash": self.password_hash,
+                "role": "astrologer",
+                "created_at": self.start,
+            })
+
+    async def run(self):
+        await self.astrologer_accounts()
+        await self.events()
+        # Users last, once their wallet balances and first activity are known
+        await self.users()
+        await self.drain()
+
+
+async def main(args):
+    started = time.monotonic()
+    try:
+        if args.drop:
+            for name in SEEDED_COLLECTIONS:
+                await db[name].drop()
+            await db.admins.delete_many({"email": {"$regex": f"@{re.escape(ASTROLOGER_EMAIL_DOMAIN)}$"}})
+        seeder = Seeder(args, await hash_password(args.password))
+        await seeder.run()
+        inserted = dict(seeder.inserted)
+        failed = dict(seeder.failed)
+        generated_s = time.monotonic() - started
+        await ensure_indexes()
+        if args.rebuild and not failed:
+            await rebuild_stats_counters(apply=True)
+            await backfill_revenue_daily()
+    finally:
+        client.close()
+    total = sum(inserted.values())
+    print(json.dumps({
+        "inserted": inserted,
+        "failed": failed,
+        "total": total,
+        "insert_s": round(generated_s, 1),
+        "docs_per_s": round(total / generated_s),
+        "elapsed_s": round(time.monotonic() - started, 1),
+    }, indent=2))
+    if failed:
+        for message, count in seeder.write_errors.most_common(5):
+            print(f"{count:,} documents rejected: {message}", file=sys.stderr)
+        # Duplicate keys usually mean the same --seed was already loaded
+        sys.exit("seeding incomplete; rerun with --drop to replace the existing data"
+                 + ("; rollups were not rebuilt" if args.rebuild else ""))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every cardinality below except --astrologers")
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--astrologers", type=int, default=200)
+    parser.add_argument("--bookings", type=int, default=3_000_000, help="astrology bookings")
+    parser.add_argument("--yoga-bookings", type=int, default=2_000_000)
+    parser.add_argument("--yoga-purchases", type=int, default=500_000)
+    parser.add_argument("--yoga-consultations", type=int, default=500_000)
+    parser.add_argument("--payment-orders", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=365, help="history to spread documents over")
+    parser.add_argument("--user-skew", type=float, default=0.8, help="Zipf exponent for user activity")
+    parser.add_argument("--astrologer-skew", type=float, default=1.2, help="Zipf exponent for astrologer popularity")
+    parser.add_argument("--paid-ratio", type=float, default=0.6, help="share of bookings paid when the wallet allows")
+    parser.add_argument("--password", default="seed-password", help="password of every seeded account")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--parallel", type=int, default=8, help="insert_many batches in flight")
+    parser.add_argument("--drop", action="store_true", help="drop the seeded collections first")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild stats_counters and revenue_daily afterwards")
+    args = parser.parse_args()
+    for field in ("users", "bookings", "yoga_bookings", "yoga_purchases", "yoga_consultations", "payment_orders"):
+        setattr(args, field, max(1, int(getattr(args, field) * args.scale)))
+    asyncio.run(main(args))
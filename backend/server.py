@@ -1,17 +1,37 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReturnDocument
 import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field
 from typing import List, Optional
 import uuid
+from abc import ABC, abstractmethod
 from datetime import datetime
 import hashlib
-import razorpay
 import hmac
+import asyncio
+import bcrypt
+from concurrent.futures import ThreadPoolExecutor
+import base64
+import csv
+import io
+import json
+import orjson
+import time
+import re
+from collections import OrderedDict, deque
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure, PyMongoError
+from pymongo import MongoClient, monitoring
+import contextvars
+import threading
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+import httpx
 
 
 def serialize_doc(doc):
@@ -27,18 +47,563 @@ def serialize_doc(doc):
         return doc
     return doc
 
+
+# Projection that keeps ObjectIds out of documents headed for the response
+NO_OBJECT_ID = {"_id": 0}
+
+
+def projection(*fields) -> dict:
+    """Projection returning only `fields`. A lookup whose filter and fields all
+    sit in one index is answered from the index alone (a covered query)."""
+    return {**NO_OBJECT_ID, **{field: 1 for field in fields}}
+
+
+def json_response(content) -> ORJSONResponse:
+    """Serialize trusted database documents with orjson, skipping response model validation.
+
+    Documents must not carry ObjectIds, so list queries project them out with NO_OBJECT_ID.
+    """
+    return ORJSONResponse(content)
+
+
+def encode_cursor(doc):
+    """Opaque keyset cursor pointing just past `doc` in (created_at, id) order"""
+    payload = json.dumps({"t": doc["created_at"].isoformat(), "id": doc["id"]})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def cursor_query(query, cursor, descending=True):
+    """Restrict `query` to documents after `cursor` in (created_at, id) order"""
+    if not cursor:
+        return query
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        created_at = datetime.fromisoformat(payload["t"])
+        last_id = payload["id"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    op = "$lt" if descending else "$gt"
+    after = {"$or": [
+        {"created_at": {op: created_at}},
+        {"created_at": created_at, "id": {op: last_id}},
+    ]}
+    return {"$and": [query, after]} if query else after
+
+
+# Sort order that keyset cursors page through (newest first, id breaks ties)
+KEYSET_SORT = [("created_at", -1), ("id", -1)]
+
+
+def next_cursor(docs, limit):
+    """Cursor for the following page, or None when this page was the last"""
+    if limit and len(docs) == limit:
+        return encode_cursor(docs[-1])
+    return None
+
+
+async def union_page(sources, match, limit, type_field):
+    """One keyset page merged across collections with a single $unionWith aggregation.
+
+    `sources` is a list of (collection_name, type_value, fields); `type_value` is
+    written to `type_field` on each row and `fields` limits the projection (None
+    keeps every field). Each branch is an index range scan capped at `limit`, so
+    only the merged page is sorted in memory.
+    """
+    branches = []
+    for collection_name, type_value, fields in sources:
+        if fields is None:
+            shape = [{"$project": {"_id": 0}}, {"$addFields": {type_field: type_value}}]
+        else:
+            shape = [{"$project": {
+                "_id": 0,
+                "id": 1,
+                type_field: {"$literal": type_value},
+                "status": 1,
+                "created_at": 1,
+                **{field: 1 for field in fields},
+            }}]
+        branches.append((collection_name, [
+            {"$match": match},
+            {"$sort": {"created_at": -1, "id": -1}},
+            {"$limit": limit},
+            *shape,
+        ]))
+    
+    (first_collection, first_branch), *others = branches
+    pipeline = [
+        *first_branch,
+        *({"$unionWith": {"coll": name, "pipeline": branch}} for name, branch in others),
+        {"$sort": {"created_at": -1, "id": -1}},
+        {"$limit": limit},
+    ]
+    rows = await db[first_collection].aggregate(pipeline).to_list(limit)
+    return rows, next_cursor(rows, limit)
+
+
+def count_if(condition):
+    """$group accumulator counting documents that satisfy an aggregation expression"""
+    return {"$sum": {"$cond": [condition, 1, 0]}}
+
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# Metrics, exposed in Prometheus text format at /metrics
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route", "status"]
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests currently being handled", ["method"]
+)
+MONGO_COMMAND_LATENCY = Histogram(
+    "mongo_command_duration_seconds", "MongoDB command latency", ["collection", "command"]
+)
+MONGO_COMMAND_FAILURES = Counter(
+    "mongo_command_failures_total", "Failed MongoDB commands", ["collection", "command"]
+)
+MONGO_POOL_CHECKOUT_WAIT = Histogram(
+    "mongo_pool_checkout_wait_seconds", "Time spent waiting to check a connection out of the pool",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+)
+MONGO_POOL_CHECKOUT_FAILURES = Counter(
+    "mongo_pool_checkout_failures_total", "Connection pool checkouts that failed", ["reason"]
+)
+RAZORPAY_LATENCY = Histogram(
+    "razorpay_request_duration_seconds", "Razorpay API latency", ["operation", "outcome"]
+)
+
+
+def command_collection(command_name: str, command) -> str:
+    """Collection a MongoDB command targets, or "-" for database-level commands"""
+    if command_name == "getMore":
+        return command.get("collection", "-")
+    target = command.get(command_name)
+    return target if isinstance(target, str) else "-"
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Records per-collection, per-command latency from pymongo command events"""
+
+    def __init__(self):
+        self._collections = {}  # (connection_id, request_id) -> collection
+
+    def started(self, event):
+        self._collections[(event.connection_id, event.request_id)] = command_collection(
+            event.command_name, event.command
+        )
+
+    def succeeded(self, event):
+        collection = self._collections.pop((event.connection_id, event.request_id), "-")
+        MONGO_COMMAND_LATENCY.labels(collection, event.command_name).observe(event.duration_micros / 1e6)
+
+    def failed(self, event):
+        collection = self._collections.pop((event.connection_id, event.request_id), "-")
+        MONGO_COMMAND_LATENCY.labels(collection, event.command_name).observe(event.duration_micros / 1e6)
+        MONGO_COMMAND_FAILURES.labels(collection, event.command_name).inc()
+
+
+class MongoPoolMetrics(monitoring.ConnectionPoolListener):
+    """Records how long requests wait for a pooled connection"""
+
+    def connection_checked_out(self, event):
+        MONGO_POOL_CHECKOUT_WAIT.observe(event.duration)
+
+    def connection_check_out_failed(self, event):
+        MONGO_POOL_CHECKOUT_FAILURES.labels(event.reason).inc()
+
+    # Remaining pool events are not measured
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_checked_in(self, event):
+        pass
+
+
+# Slow-query log. Commands slower than SLOW_QUERY_MS are logged with their
+# literal values redacted, the route that issued them and an
+# explain("executionStats") summary, at most once per SLOW_QUERY_LOG_INTERVAL
+# per query shape. With FAIL_ON_COLLSCAN (for development) every new query
+# shape is explained up front and requests that trigger a COLLSCAN fail,
+# except those that read whole collections by design (allow_collection_scan).
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', '100'))
+SLOW_QUERY_LOG_INTERVAL = float(os.environ.get('SLOW_QUERY_LOG_INTERVAL', '60'))
+FAIL_ON_COLLSCAN = os.environ.get('FAIL_ON_COLLSCAN', '').lower() in ('1', 'true', 'yes')
+
+slow_query_logger = logging.getLogger("slow_queries")
+
+# Commands explain() accepts, and the parts of each that define its shape
+EXPLAINABLE_COMMANDS = {
+    "find": ("filter", "sort", "projection"),
+    "aggregate": ("pipeline",),
+    "count": ("query",),
+    "distinct": ("key", "query"),
+    "findAndModify": ("query", "sort"),
+    "update": ("updates",),
+    "delete": ("deletes",),
+}
+# Driver-added fields that explain() rejects or that are not part of the query
+EXPLAIN_IGNORED_FIELDS = {"lsid", "$db", "$clusterTime", "txnNumber", "$readPreference", "signature"}
+# Write commands whose statement list explain() only accepts with a single entry
+EXPLAIN_SINGLE_STATEMENT = {"update": "updates", "delete": "deletes"}
+
+
+class QueryContext:
+    """Per-request state shared with command listeners"""
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.collscans = []
+        self.allow_collscan = False
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get("route")
+        return route.path if route else self.scope.get("path", "-")
+
+
+current_query_context = contextvars.ContextVar("current_query_context", default=None)
+
+
+def allow_collection_scan():
+    """Exempt the current request from FAIL_ON_COLLSCAN; for handlers that read whole collections by design"""
+    context = current_query_context.get()
+    if context is not None:
+        context.allow_collscan = True
+
+
+def redact(value):
+    """Query shape with every literal replaced by "?" (operators and field names kept)"""
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [redact(item) for item in value] if any(isinstance(item, (dict, list)) for item in value) else ["?"]
+    return "?"
+
+
+def plan_stages(explain) -> list:
+    """Every plan stage name that appears anywhere in an explain document"""
+    stages = []
+    if isinstance(explain, dict):
+        for key, value in explain.items():
+            if key == "stage" and isinstance(value, str):
+                stages.append(value)
+            else:
+                stages.extend(plan_stages(value))
+    elif isinstance(explain, list):
+        for item in explain:
+            stages.extend(plan_stages(item))
+    return stages
+
+
+def find_stat(explain, name):
+    """First value of an executionStats counter anywhere in an explain document"""
+    if isinstance(explain, dict):
+        if name in explain:
+            return explain[name]
+        values = explain.values()
+    elif isinstance(explain, list):
+        values = explain
+    else:
+        return None
+    for value in values:
+        found = find_stat(value, name)
+        if found is not None:
+            return found
+    return None
+
+
+class SlowQueryLog(monitoring.CommandListener):
+    def __init__(self, url: str):
+        self._url = url
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._commands = {}  # (connection_id, request_id) -> (database, command name, command, context)
+        self._last_logged = {}  # shape key -> monotonic time
+        self._collscan_shapes = {}  # shape key -> bool, for FAIL_ON_COLLSCAN
+        self._explain_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+
+    def _explain_client(self) -> MongoClient:
+        with self._client_lock:
+            if self._client is None:
+                self._client = MongoClient(self._url)
+            return self._client
+
+    def started(self, event):
+        # Kept cheap: the command is only redacted once it turns out to be slow
+        # or has to be checked for a COLLSCAN
+        if event.command_name not in EXPLAINABLE_COMMANDS:
+            return
+        statements = EXPLAIN_SINGLE_STATEMENT.get(event.command_name)
+        if statements and len(event.command.get(statements, ())) != 1:
+            return
+        self._commands[(event.connection_id, event.request_id)] = (
+            event.database_name, event.command_name, event.command, current_query_context.get()
+        )
+
+    def succeeded(self, event):
+        entry = self._commands.pop((event.connection_id, event.request_id), None)
+        if entry:
+            self._check(entry, event.duration_micros / 1000)
+
+    def failed(self, event):
+        self._commands.pop((event.connection_id, event.request_id), None)
+
+    @staticmethod
+    def _shape(command_name: str, raw_command):
+        """(explainable command, redacted shape), or None for commands explain() would execute"""
+        command = {key: value for key, value in raw_command.items() if key not in EXPLAIN_IGNORED_FIELDS}
+        if command_name == "aggregate" and any(
+            "$merge" in stage or "$out" in stage for stage in command.get("pipeline", [])
+        ):
+            return None  # executionStats would run the write
+        shape = {
+            "command": command_name,
+            "collection": command_collection(command_name, command),
+            **{part: redact(command[part]) for part in EXPLAINABLE_COMMANDS[command_name] if part in command},
+        }
+        return command, shape
+
+    def _check(self, entry, duration_ms: float):
+        database, command_name, command, context = entry
+        check_collscan = FAIL_ON_COLLSCAN and context is not None and not context.allow_collscan
+        if not check_collscan and duration_ms < SLOW_QUERY_MS:
+            return
+        explainable = self._shape(command_name, command)
+        if explainable is None:
+            return
+        command, shape = explainable
+        key = json.dumps(shape, sort_keys=True)
+
+        if check_collscan:
+            # Explained inline, once per shape, so the request can still be failed
+            if key not in self._collscan_shapes:
+                explain = self._explain(database, command)
+                self._collscan_shapes[key] = explain is not None and "COLLSCAN" in plan_stages(explain)
+            if self._collscan_shapes[key]:
+                context.collscans.append(shape)
+
+        if duration_ms < SLOW_QUERY_MS:
+            return
+        now = time.monotonic()
+        if now - self._last_logged.get(key, -SLOW_QUERY_LOG_INTERVAL) < SLOW_QUERY_LOG_INTERVAL:
+            return
+        if len(self._last_logged) > 10000:
+            self._last_logged.clear()
+        self._last_logged[key] = now
+        route = context.route if context else "-"
+        self._explain_pool.submit(self._log_slow_query, database, command, shape, route, duration_ms)
+
+    def _explain(self, database: str, command: dict):
+        try:
+            return self._explain_client()[database].command(
+                {"explain": command, "verbosity": "executionStats"}
+            )
+        except Exception as e:
+            slow_query_logger.warning(f"explain failed for {command_collection(next(iter(command)), command)}: {e!r}")
+            return None
+
+    def _log_slow_query(self, database, command, shape, route, duration_ms):
+        explain = self._explain(database, command)
+        plan = {}
+        if explain is not None:
+            plan = {
+                "stages": plan_stages(explain),
+                "docs_examined": find_stat(explain, "totalDocsExamined"),
+                "keys_examined": find_stat(explain, "totalKeysExamined"),
+                "returned": find_stat(explain, "nReturned"),
+            }
+        slow_query_logger.warning(
+            f"Slow query {duration_ms:.1f}ms route={route} "
+            f"shape={json.dumps(shape, sort_keys=True)} plan={json.dumps(plan)}"
+        )
+
+    def close(self):
+        self._explain_pool.shutdown(wait=False)
+        if self._client is not None:
+            self._client.close()
+
+
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+slow_query_log = SlowQueryLog(mongo_url)
+client = AsyncIOMotorClient(
+    mongo_url, event_listeners=[MongoCommandMetrics(), MongoPoolMetrics(), slow_query_log]
+)
 db = client[os.environ['DB_NAME']]
 
 # Razorpay client
 razorpay_key_id = os.environ.get('RAZORPAY_KEY_ID', '')
 razorpay_key_secret = os.environ.get('RAZORPAY_KEY_SECRET', '')
-razorpay_client = razorpay.Client(auth=(razorpay_key_id, razorpay_key_secret))
+
+
+class PaymentGatewayError(Exception):
+    """Raised when the payment gateway rejects or fails a request"""
+
+
+class PaymentGateway(ABC):
+    """Interface the payment routes talk to"""
+
+    @abstractmethod
+    async def create_order(self, order_data: dict) -> dict:
+        """Create an order with the gateway and return its response"""
+
+    @abstractmethod
+    def verify_payment_signature(self, order_id: str, payment_id: str, signature: str) -> bool:
+        """Whether `signature` is the gateway's signature for this order and payment"""
+
+    async def close(self):
+        pass
+
+
+class RazorpayGateway(PaymentGateway):
+    """Async Razorpay REST client over a pooled keep-alive HTTP connection"""
+
+    def __init__(
+        self,
+        key_id: str,
+        key_secret: str,
+        base_url: str = "https://api.razorpay.com/v1",
+        timeout: float = 10.0,
+        max_connections: int = 20,
+        max_concurrency: int = 20,
+    ):
+        self.key_id = key_id
+        self.key_secret = key_secret
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            auth=(key_id, key_secret),
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def create_order(self, order_data: dict) -> dict:
+        async with self._semaphore:
+            started = time.perf_counter()
+            try:
+                response = await self._client.post("/orders", json=order_data)
+            except httpx.HTTPError as e:
+                RAZORPAY_LATENCY.labels("create_order", "error").observe(time.perf_counter() - started)
+                raise PaymentGatewayError(f"Razorpay request failed: {e!r}") from e
+            outcome = "ok" if response.status_code < 400 else "http_error"
+            RAZORPAY_LATENCY.labels("create_order", outcome).observe(time.perf_counter() - started)
+        if response.status_code >= 400:
+            raise PaymentGatewayError(f"Razorpay returned {response.status_code}: {response.text}")
+        return response.json()
+
+    def verify_payment_signature(self, order_id: str, payment_id: str, signature: str) -> bool:
+        """Check the checkout signature locally (HMAC-SHA256 of order_id|payment_id)"""
+        expected = hmac.new(
+            self.key_secret.encode(),
+            f"{order_id}|{payment_id}".encode(),
+            hashlib.sha256,
+        ).hexdigest()
+        return hmac.compare_digest(expected, signature)
+
+    async def close(self):
+        await self._client.aclose()
+
+
+# RAZORPAY_API_URL can point at razorpay_stub.py for offline load tests
+payment_gateway = RazorpayGateway(
+    razorpay_key_id,
+    razorpay_key_secret,
+    base_url=os.environ.get('RAZORPAY_API_URL', 'https://api.razorpay.com/v1'),
+    timeout=float(os.environ.get('RAZORPAY_TIMEOUT', '10')),
+    max_connections=int(os.environ.get('RAZORPAY_MAX_CONNECTIONS', '20')),
+    max_concurrency=int(os.environ.get('RAZORPAY_MAX_CONCURRENCY', '20')),
+)
+
+# Indexes applied at startup, keyed by collection. Each entry mirrors the
+# filter (and sort) shape of a query issued by the routes below, so none of
+# them fall back to a collection scan. create_indexes is a no-op for indexes
+# that already exist with the same spec, so this is safe to run on every boot.
+INDEXES = {
+    "users": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        # Covers wallet balance reads
+        IndexModel([("id", ASCENDING), ("wallet_balance", ASCENDING)]),
+        IndexModel([("email", ASCENDING)]),
+        IndexModel([("phone", ASCENDING)]),
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)]),
+        # Normalized search fields (see user_search_fields)
+        IndexModel([("search_tokens", ASCENDING)]),
+        IndexModel([("email_lower", ASCENDING)]),
+        IndexModel([("phone_digits", ASCENDING)]),
+    ],
+    "admins": [
+        IndexModel([("email", ASCENDING)]),
+    ],
+    "astrologers": [
+        IndexModel([("name", ASCENDING)]),
+    ],
+    "bookings": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]),
+        IndexModel([("astrologer_name", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]),
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]),
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)]),
+    ],
+    "yoga_bookings": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]),
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]),
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)]),
+    ],
+    "yoga_purchases": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]),
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]),
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)]),
+    ],
+    "yoga_consultations": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]),
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]),
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)]),
+    ],
+    "transactions": [
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]),
+        IndexModel([("type", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]),
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)]),
+    ],
+    "payment_orders": [
+        IndexModel([("order_id", ASCENDING)], unique=True),
+    ],
+    "revenue_daily": [
+        IndexModel([("type", ASCENDING), ("day", ASCENDING)]),
+    ],
+}
+
+
+async def ensure_indexes():
+    """Create every index in INDEXES (idempotent)"""
+    for collection_name, indexes in INDEXES.items():
+        await db[collection_name].create_indexes(indexes)
+
 
 # Create the main app without a prefix
 app = FastAPI()
@@ -291,11 +856,179 @@ class YogaConsultation(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
-def hash_password(password: str) -> str:
-    """Simple password hashing using SHA256"""
+# Fields each user/admin read path needs
+USER_RESPONSE_FIELDS = projection(*UserResponse.model_fields)
+USER_LOGIN_FIELDS = projection(*UserResponse.model_fields, "password_hash")
+ADMIN_LOGIN_FIELDS = projection("id", "fullName", "email", "role", "created_at", "password_hash")
+
+
+# Fields derived on write so admin search can use anchored prefix lookups
+USER_SEARCH_FIELDS = ("search_tokens", "email_lower", "phone_digits")
+
+
+def user_search_fields(full_name: str, email: str, phone: str) -> dict:
+    """Lower-cased name tokens, email and digits-only phone numbers for indexed search"""
+    digits = re.sub(r"\D", "", phone or "")
+    return {
+        "search_tokens": sorted(set((full_name or "").lower().split())),
+        "email_lower": (email or "").strip().lower(),
+        # Full number plus the local 10 digits, so searches work with or without a country code
+        "phone_digits": sorted({digits, digits[-10:]}) if digits else [],
+    }
+
+
+def user_search_query(search: str) -> dict:
+    """Index-backed query matching users by name-word prefix, email or phone prefix"""
+    term = search.strip().lower()
+    words = term.split()
+    if not words:
+        return {}
+    name_clauses = [{"search_tokens": {"$regex": f"^{re.escape(word)}"}} for word in words]
+    clauses = [
+        name_clauses[0] if len(name_clauses) == 1 else {"$and": name_clauses},
+        {"email_lower": {"$regex": f"^{re.escape(term)}"}},
+    ]
+    digits = re.sub(r"\D", "", term)
+    if digits and not re.search(r"[a-z@]", term):
+        clauses.append({"phone_digits": {"$regex": f"^{digits}"}})
+    return {"$or": clauses}
+
+
+async def backfill_user_search_fields(batch_size: int = 1000) -> int:
+    """Populate search fields on users created before they existed; returns the count.
+
+    Run through backfill_user_search_fields.py; until then those users are
+    missing from /admin/users search results.
+    """
+    updated = 0
+    cursor = db.users.find(
+        {"search_tokens": {"$exists": False}},
+        {"_id": 1, "full_name": 1, "email": 1, "phone": 1}
+    ).batch_size(batch_size)
+    updates = []
+    async for user in cursor:
+        fields = user_search_fields(user.get("full_name"), user.get("email"), user.get("phone"))
+        updates.append(UpdateOne({"_id": user["_id"]}, {"$set": fields}))
+        if len(updates) >= batch_size:
+            await db.users.bulk_write(updates, ordered=False)
+            updated += len(updates)
+            updates = []
+    if updates:
+        await db.users.bulk_write(updates, ordered=False)
+        updated += len(updates)
+    return updated
+
+
+# Bulk creation
+MAX_BULK_ITEMS = int(os.environ.get('MAX_BULK_ITEMS', '500'))
+
+
+async def bulk_insert(collection, models: list) -> list:
+    """insert_many(ordered=False) for `models`, returning one result dict per item"""
+    if not models:
+        raise HTTPException(status_code=400, detail="At least one item is required")
+    if len(models) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ITEMS} items per request")
+    
+    errors = {}
+    try:
+        await collection.insert_many([model.dict() for model in models], ordered=False)
+    except BulkWriteError as e:
+        errors = {error["index"]: error.get("errmsg", "Write failed") for error in e.details["writeErrors"]}
+    
+    return [
+        {"index": index, "success": False, "error": errors[index]} if index in errors
+        else {"index": index, "success": True, "data": model.dict()}
+        for index, model in enumerate(models)
+    ]
+
+
+def bulk_response(results: list) -> ORJSONResponse:
+    inserted = sum(1 for result in results if result["success"])
+    return json_response({
+        "inserted": inserted,
+        "failed": len(results) - inserted,
+        "results": results
+    })
+
+
+# Password hashing: bcrypt runs in a bounded worker pool so ~250ms of CPU per
+# hash never blocks the event loop. Requests beyond PASSWORD_HASH_QUEUE_LIMIT
+# are turned away with 503 instead of queueing without bound.
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', '12'))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.environ.get('PASSWORD_HASH_QUEUE_LIMIT', '64'))
+password_hash_pool = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('PASSWORD_HASH_WORKERS', '4')),
+    thread_name_prefix="password-hash",
+)
+_password_hash_pending = 0
+
+
+async def _run_password_hash(fn, *args):
+    global _password_hash_pending
+    if _password_hash_pending >= PASSWORD_HASH_QUEUE_LIMIT:
+        raise HTTPException(status_code=503, detail="Server busy, please retry shortly")
+    _password_hash_pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(password_hash_pool, fn, *args)
+    finally:
+        _password_hash_pending -= 1
+
+
+def legacy_password_hash(password: str) -> str:
+    """Unsalted SHA256 used before bcrypt; only checked so old hashes can be upgraded"""
     return hashlib.sha256(password.encode()).hexdigest()
 
 
+def _bcrypt_hash(password: str) -> str:
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(BCRYPT_ROUNDS)).decode()
+
+
+def _bcrypt_check(password: str, password_hash: str) -> bool:
+    return bcrypt.checkpw(password.encode(), password_hash.encode())
+
+
+async def hash_password(password: str) -> str:
+    """bcrypt hash of `password` at the configured cost"""
+    return await _run_password_hash(_bcrypt_hash, password)
+
+
+async def verify_password(password: str, password_hash: str):
+    """Check `password` against a stored hash.
+
+    Returns (matches, needs_rehash); needs_rehash is True for legacy SHA256
+    hashes and bcrypt hashes below the configured cost.
+    """
+    if password_hash.startswith("$2"):
+        matches = await _run_password_hash(_bcrypt_check, password, password_hash)
+        return matches, matches and int(password_hash.split("$")[2]) < BCRYPT_ROUNDS
+    matches = hmac.compare_digest(legacy_password_hash(password), password_hash)
+    return matches, matches
+
+
+async def upgrade_password_hash(collection, record_id: str, password: str):
+    """Replace a legacy or weaker hash after a successful login"""
+    try:
+        await collection.update_one(
+            {"id": record_id},
+            {"$set": {"password_hash": await hash_password(password)}}
+        )
+    except Exception as e:
+        logger.error(f"Error upgrading password hash for {record_id}: {str(e)}")
+
+
+# Hash upgrades run after the login has been answered; the set keeps a reference
+# to each pending task so it is not garbage-collected before it finishes
+_password_upgrades = set()
+
+
+def schedule_password_upgrade(collection, record_id: str, password: str):
+    """Upgrade the stored hash in the background instead of on the login's latency"""
+    task = asyncio.create_task(upgrade_password_hash(collection, record_id, password))
+    _password_upgrades.add(task)
+    task.add_done_callback(_password_upgrades.discard)
+
+
 # Status Routes
 @api_router.get("/")
 async def root():
@@ -320,7 +1053,7 @@ async def get_status_checks():
 async def admin_signup(admin_data: AdminCreate):
     """Register a new admin or astrologer"""
     # Check if email already exists
-    existing_admin = await db.admins.find_one({"email": admin_data.email})
+    existing_admin = await db.admins.find_one({"email": admin_data.email}, projection("email"))
     if existing_admin:
         return {
             "success": False,
@@ -331,7 +1064,7 @@ async def admin_signup(admin_data: AdminCreate):
     admin = Admin(
         fullName=admin_data.fullName,
         email=admin_data.email,
-        password_hash=hash_password(admin_data.password),
+        password_hash=await hash_password(admin_data.password),
         role=admin_data.role,
     )
     
@@ -354,7 +1087,7 @@ async def admin_signup(admin_data: AdminCreate):
 async def admin_login(credentials: AdminLogin):
     """Login for admin or astrologer"""
     # Find admin by email
-    admin = await db.admins.find_one({"email": credentials.email})
+    admin = await db.admins.find_one({"email": credentials.email}, ADMIN_LOGIN_FIELDS)
     
     if not admin:
         return {
@@ -363,11 +1096,14 @@ async def admin_login(credentials: AdminLogin):
         }
     
     # Verify password
-    if admin["password_hash"] != hash_password(credentials.password):
+    matches, needs_rehash = await verify_password(credentials.password, admin["password_hash"])
+    if not matches:
         return {
             "success": False,
             "message": "Invalid email or password"
         }
+    if needs_rehash:
+        schedule_password_upgrade(db.admins, admin["id"], credentials.password)
     
     return {
         "success": True,
@@ -387,12 +1123,12 @@ async def admin_login(credentials: AdminLogin):
 async def signup(user_data: UserCreate):
     """Register a new user"""
     # Check if email already exists
-    existing_user = await db.users.find_one({"email": user_data.email})
+    existing_user = await db.users.find_one({"email": user_data.email}, projection("email"))
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Check if phone already exists
-    existing_phone = await db.users.find_one({"phone": user_data.phone})
+    existing_phone = await db.users.find_one({"phone": user_data.phone}, projection("phone"))
     if existing_phone:
         raise HTTPException(status_code=400, detail="Phone number already registered")
     
@@ -401,14 +1137,22 @@ async def signup(user_data: UserCreate):
         full_name=user_data.full_name,
         email=user_data.email,
         phone=user_data.phone,
-        password_hash=hash_password(user_data.password),
+        password_hash=await hash_password(user_data.password),
         gender=user_data.gender,
         date_of_birth=user_data.date_of_birth,
         time_of_birth=user_data.time_of_birth,
         location=user_data.location,
     )
     
-    await db.users.insert_one(user.dict())
+    await db.users.insert_one({
+        **user.dict(),
+        **user_search_fields(user.full_name, user.email, user.phone),
+    })
+    await bump_stats_counters({
+        "users_total": 1,
+        month_field(user.created_at, "new_users"): 1,
+    })
+    admin_cache.invalidate("recent_activity")
     
     return UserResponse(
         id=user.id,
@@ -429,14 +1173,17 @@ async def signup(user_data: UserCreate):
 async def login(credentials: UserLogin):
     """Login a user"""
     # Find user by email
-    user = await db.users.find_one({"email": credentials.email})
+    user = await db.users.find_one({"email": credentials.email}, USER_LOGIN_FIELDS)
     
     if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
     # Verify password
-    if user["password_hash"] != hash_password(credentials.password):
+    matches, needs_rehash = await verify_password(credentials.password, user["password_hash"])
+    if not matches:
         raise HTTPException(status_code=401, detail="Invalid email or password")
+    if needs_rehash:
+        schedule_password_upgrade(db.users, user["id"], credentials.password)
     
     return UserResponse(
         id=user["id"],
@@ -456,7 +1203,7 @@ async def login(credentials: UserLogin):
 @api_router.get("/users/{user_id}", response_model=UserResponse)
 async def get_user(user_id: str):
     """Get user by ID"""
-    user = await db.users.find_one({"id": user_id})
+    user = await db.users.find_one({"id": user_id}, USER_RESPONSE_FIELDS)
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -495,6 +1242,8 @@ async def create_booking(booking_data: BookingCreate):
     )
     
     await db.bookings.insert_one(booking.dict())
+    await bump_stats_counters({"bookings_total": 1, "bookings_pending": 1})
+    admin_cache.invalidate("recent_activity")
     
     return BookingResponse(
         id=booking.id,
@@ -514,32 +1263,32 @@ async def create_booking(booking_data: BookingCreate):
     )
 
 
+@api_router.post("/bookings/bulk")
+async def create_bookings_bulk(bookings_data: List[BookingCreate]):
+    """Create several astrology session bookings in one round trip"""
+    bookings = [Booking(**booking_data.dict()) for booking_data in bookings_data]
+    results = await bulk_insert(db.bookings, bookings)
+    
+    inserted = sum(1 for result in results if result["success"])
+    await bump_stats_counters({"bookings_total": inserted, "bookings_pending": inserted})
+    admin_cache.invalidate("recent_activity")
+    
+    return bulk_response(results)
+
+
+BOOKING_RESPONSE_FIELDS = projection(*BookingResponse.model_fields)
+
 @api_router.get("/bookings/user/{user_id}", response_model=List[BookingResponse])
 async def get_user_bookings(user_id: str):
     """Get all bookings for a user"""
-    bookings = await db.bookings.find({"user_id": user_id}).to_list(100)
-    return [BookingResponse(
-        id=b["id"],
-        user_id=b["user_id"],
-        astrologer_id=b["astrologer_id"],
-        astrologer_name=b["astrologer_name"],
-        astrologer_expertise=b["astrologer_expertise"],
-        astrologer_experience=b["astrologer_experience"],
-        astrologer_languages=b["astrologer_languages"],
-        service_name=b["service_name"],
-        service_duration=b["service_duration"],
-        service_price=b["service_price"],
-        booking_date=b["booking_date"],
-        booking_time=b["booking_time"],
-        status=b["status"],
-        created_at=b["created_at"],
-    ) for b in bookings]
+    bookings = await db.bookings.find({"user_id": user_id}, BOOKING_RESPONSE_FIELDS).to_list(100)
+    return json_response(bookings)
 
 
 @api_router.get("/bookings/{booking_id}", response_model=BookingResponse)
 async def get_booking(booking_id: str):
     """Get booking by ID"""
-    booking = await db.bookings.find_one({"id": booking_id})
+    booking = await db.bookings.find_one({"id": booking_id}, BOOKING_RESPONSE_FIELDS)
     
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
@@ -578,6 +1327,8 @@ async def create_yoga_class_booking(booking_data: YogaClassBookingCreate):
     )
     
     await db.yoga_bookings.insert_one(booking.dict())
+    await bump_stats_counters({"yoga_classes": 1})
+    admin_cache.invalidate("recent_activity")
     
     return YogaClassBookingResponse(
         id=booking.id,
@@ -595,6 +1346,18 @@ async def create_yoga_class_booking(booking_data: YogaClassBookingCreate):
     )
 
 
+@api_router.post("/yoga/class-booking/bulk")
+async def create_yoga_class_bookings_bulk(bookings_data: List[YogaClassBookingCreate]):
+    """Create several yoga class bookings in one round trip"""
+    bookings = [YogaClassBooking(**booking_data.dict()) for booking_data in bookings_data]
+    results = await bulk_insert(db.yoga_bookings, bookings)
+    
+    await bump_stats_counters({"yoga_classes": sum(1 for result in results if result["success"])})
+    admin_cache.invalidate("recent_activity")
+    
+    return bulk_response(results)
+
+
 # Yoga Package Purchase Routes
 @api_router.post("/yoga/package-purchase", response_model=YogaPackagePurchaseResponse)
 async def create_yoga_package_purchase(purchase_data: YogaPackagePurchaseCreate):
@@ -610,6 +1373,8 @@ async def create_yoga_package_purchase(purchase_data: YogaPackagePurchaseCreate)
     )
     
     await db.yoga_purchases.insert_one(purchase.dict())
+    await bump_stats_counters({"yoga_packages": 1})
+    admin_cache.invalidate("recent_activity")
     
     return YogaPackagePurchaseResponse(
         id=purchase.id,
@@ -626,6 +1391,18 @@ async def create_yoga_package_purchase(purchase_data: YogaPackagePurchaseCreate)
     )
 
 
+@api_router.post("/yoga/package-purchase/bulk")
+async def create_yoga_package_purchases_bulk(purchases_data: List[YogaPackagePurchaseCreate]):
+    """Create several yoga package purchases in one round trip"""
+    purchases = [YogaPackagePurchase(**purchase_data.dict()) for purchase_data in purchases_data]
+    results = await bulk_insert(db.yoga_purchases, purchases)
+    
+    await bump_stats_counters({"yoga_packages": sum(1 for result in results if result["success"])})
+    admin_cache.invalidate("recent_activity")
+    
+    return bulk_response(results)
+
+
 # Yoga Consultation Booking Routes
 @api_router.post("/yoga/consultation", response_model=YogaConsultationResponse)
 async def create_yoga_consultation(consultation_data: YogaConsultationCreate):
@@ -641,6 +1418,8 @@ async def create_yoga_consultation(consultation_data: YogaConsultationCreate):
     )
     
     await db.yoga_consultations.insert_one(consultation.dict())
+    await bump_stats_counters({"consultations": 1})
+    admin_cache.invalidate("recent_activity")
     
     return YogaConsultationResponse(
         id=consultation.id,
@@ -662,15 +1441,46 @@ async def create_yoga_consultation(consultation_data: YogaConsultationCreate):
 @api_router.get("/yoga/user/{user_id}/bookings")
 async def get_user_yoga_bookings(user_id: str):
     """Get all yoga-related bookings for a user"""
-    class_bookings = await db.yoga_bookings.find({"user_id": user_id}).to_list(100)
-    package_purchases = await db.yoga_purchases.find({"user_id": user_id}).to_list(100)
-    consultations = await db.yoga_consultations.find({"user_id": user_id}).to_list(100)
+    class_bookings = await db.yoga_bookings.find({"user_id": user_id}, NO_OBJECT_ID).to_list(100)
+    package_purchases = await db.yoga_purchases.find({"user_id": user_id}, NO_OBJECT_ID).to_list(100)
+    consultations = await db.yoga_consultations.find({"user_id": user_id}, NO_OBJECT_ID).to_list(100)
     
-    return {
+    return json_response({
         "class_bookings": class_bookings,
         "package_purchases": package_purchases,
         "consultations": consultations,
-    }
+    })
+
+
+# Collections merged into the yoga timeline, with the fields the app renders for each
+YOGA_TIMELINE_SOURCES = [
+    ("yoga_bookings", "yoga_class", [
+        "class_name", "class_date", "class_time", "guru_name", "price", "credits", "level",
+    ]),
+    ("yoga_purchases", "yoga_package", [
+        "package_name", "price", "credits", "validity", "mode", "session_type",
+    ]),
+    ("yoga_consultations", "yoga_consultation", [
+        "yoga_goal", "intensity_preference", "connection_method", "schedule_timing", "price",
+    ]),
+]
+
+
+@api_router.get("/yoga/user/{user_id}/timeline")
+async def get_user_yoga_timeline(user_id: str, limit: int = Query(20, ge=1, le=100), cursor: str = None):
+    """Get a user's yoga class bookings, package purchases and consultations as one
+    newest-first, cursor-paginated list"""
+    entries, next_page = await union_page(
+        YOGA_TIMELINE_SOURCES,
+        cursor_query({"user_id": user_id}, cursor),
+        limit,
+        "entry_type"
+    )
+    
+    return json_response({
+        "entries": entries,
+        "next_cursor": next_page
+    })
 
 
 # ============= RAZORPAY PAYMENT INTEGRATION =============
@@ -713,6 +1523,7 @@ class TransactionRecord(BaseModel):
     payment_id: Optional[str] = None
     order_id: Optional[str] = None
     booking_id: Optional[str] = None
+    booking_type: Optional[str] = None  # set on booking debits
     status: str = "completed"
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -725,6 +1536,143 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Daily revenue rollups: one revenue_daily document per (day, type, category),
+# where category is the booking type of a debit. /admin/revenue-analytics reads
+# these instead of grouping raw transactions.
+def revenue_category(transaction: TransactionRecord) -> str:
+    if transaction.booking_type:
+        return transaction.booking_type
+    return "wallet_recharge" if transaction.type == "credit" else "other"
+
+
+async def bump_revenue_daily(transaction: TransactionRecord):
+    day = transaction.created_at.strftime("%Y-%m-%d")
+    category = revenue_category(transaction)
+    try:
+        await db.revenue_daily.update_one(
+            {"_id": f"{day}|{transaction.type}|{category}"},
+            {
+                "$inc": {"revenue": transaction.amount, "count": 1},
+                # Tells a concurrent backfill_revenue_daily not to drop this bucket
+                "$set": {"bumped_at": datetime.utcnow()},
+                "$setOnInsert": {"day": day, "type": transaction.type, "category": category},
+            },
+            upsert=True
+        )
+    except Exception as e:
+        logger.error(f"Error updating revenue rollup for transaction {transaction.id}: {str(e)}")
+
+
+# Groups transactions into revenue_daily buckets, keyed as in bump_revenue_daily
+REVENUE_DAILY_BUCKETS = [
+    {"$group": {
+        "_id": {
+            "day": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}},
+            "type": "$type",
+            "category": {"$ifNull": [
+                "$booking_type",
+                {"$cond": [{"$eq": ["$type", "credit"]}, "wallet_recharge", "other"]}
+            ]},
+        },
+        "revenue": {"$sum": "$amount"},
+        "count": {"$sum": 1},
+    }},
+    {"$project": {
+        "_id": {"$concat": ["$_id.day", "|", "$_id.type", "|", "$_id.category"]},
+        "day": "$_id.day",
+        "type": "$_id.type",
+        "category": "$_id.category",
+        "revenue": 1,
+        "count": 1,
+    }},
+]
+
+
+async def backfill_revenue_daily() -> int:
+    """Rebuild revenue_daily from the transactions collection; returns the bucket count"""
+    rebuilt_at = datetime.utcnow()
+    await db.transactions.aggregate([
+        *REVENUE_DAILY_BUCKETS,
+        {"$set": {"rebuilt_at": {"$literal": rebuilt_at}}},
+        {"$merge": {"into": "revenue_daily", "whenMatched": "replace", "whenNotMatched": "insert"}},
+    ]).to_list(None)
+    # Buckets whose transactions are gone were not rewritten above. Those bumped
+    # since the rebuild started hold transactions the $group did not see.
+    await db.revenue_daily.delete_many({
+        "rebuilt_at": {"$ne": rebuilt_at},
+        "bumped_at": {"$not": {"$gte": rebuilt_at}},
+    })
+    admin_cache.invalidate("revenue_analytics")
+    return await db.revenue_daily.count_documents({})
+
+
+async def subtract_revenue_daily(match: dict):
+    """Take the transactions matching `match` out of their revenue_daily buckets.
+
+    Call before deleting them. Buckets left without transactions are removed.
+    """
+    buckets = await db.transactions.aggregate([{"$match": match}, *REVENUE_DAILY_BUCKETS]).to_list(None)
+    if not buckets:
+        return
+    await db.revenue_daily.bulk_write([
+        UpdateOne({"_id": bucket["_id"]}, {"$inc": {"revenue": -bucket["revenue"], "count": -bucket["count"]}})
+        for bucket in buckets
+    ], ordered=False)
+    await db.revenue_daily.delete_many({
+        "_id": {"$in": [bucket["_id"] for bucket in buckets]},
+        "count": {"$lte": 0},
+    })
+    admin_cache.invalidate("revenue_analytics")
+
+
+async def insert_transaction(transaction: TransactionRecord, counters: dict = None):
+    """Persist a wallet transaction, apply its rollup and stats_counters increments,
+    and drop the admin views derived from it"""
+    await db.transactions.insert_one(transaction.dict())
+    # The two rollups are independent of each other, so they share one round trip
+    await asyncio.gather(bump_revenue_daily(transaction), bump_stats_counters(counters or {}))
+    admin_cache.invalidate("revenue_analytics", "recent_activity")
+
+
+# Wallet balance changes are single conditional $inc updates, so concurrent
+# requests can neither lose updates nor overdraw a wallet.
+class InsufficientBalanceError(Exception):
+    def __init__(self, current_balance: float):
+        super().__init__("Insufficient balance")
+        self.current_balance = current_balance
+
+
+async def wallet_credit(user_id: str, amount: float) -> float:
+    """Add `amount` to the user's wallet and return the new balance"""
+    user = await db.users.find_one_and_update(
+        {"id": user_id},
+        {"$inc": {"wallet_balance": amount}},
+        projection=projection("wallet_balance"),
+        return_document=ReturnDocument.AFTER
+    )
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user["wallet_balance"]
+
+
+async def wallet_debit(user_id: str, amount: float) -> float:
+    """Take `amount` from the user's wallet if it covers it and return the new balance"""
+    user = await db.users.find_one_and_update(
+        {"id": user_id, "wallet_balance": {"$gte": amount}},
+        {"$inc": {"wallet_balance": -amount}},
+        projection=projection("wallet_balance"),
+        return_document=ReturnDocument.AFTER
+    )
+    if user:
+        return user["wallet_balance"]
+    
+    # Only the failure path pays for a second read, to tell the two cases apart
+    user = await db.users.find_one({"id": user_id}, projection("id", "wallet_balance"))
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    raise InsufficientBalanceError(user.get("wallet_balance", 0))
+
+
 # Create Razorpay Order
 @api_router.post("/payment/create-order", response_model=CreateOrderResponse)
 async def create_razorpay_order(request: CreateOrderRequest):
@@ -744,7 +1692,7 @@ async def create_razorpay_order(request: CreateOrderRequest):
             }
         }
         
-        order = razorpay_client.order.create(data=order_data)
+        order = await payment_gateway.create_order(order_data)
         
         # Store order in database for verification
         await db.payment_orders.insert_one({
@@ -774,67 +1722,62 @@ async def create_razorpay_order(request: CreateOrderRequest):
 async def verify_payment(request: VerifyPaymentRequest):
     """Verify Razorpay payment and add balance to wallet"""
     try:
-        # 1. Prevent duplicate processing
-        existing_order = await db.payment_orders.find_one({
-            "order_id": request.razorpay_order_id,
-            "status": "completed"
-        })
-        if existing_order:
-            user = await db.users.find_one({"id": request.user_id})
-            return {
-                "success": True,
-                "message": "Payment already processed",
-                "new_balance": user.get("wallet_balance", 0) if user else 0
-            }
-
-        # 2. Verify signature using Razorpay SDK
-        try:
-            razorpay_client.utility.verify_payment_signature({
-                "razorpay_order_id": request.razorpay_order_id,
-                "razorpay_payment_id": request.razorpay_payment_id,
-                "razorpay_signature": request.razorpay_signature
-            })
-        except razorpay.errors.SignatureVerificationError:
+        # 1. Verify signature (HMAC, computed in-process)
+        if not payment_gateway.verify_payment_signature(
+            request.razorpay_order_id,
+            request.razorpay_payment_id,
+            request.razorpay_signature,
+        ):
             raise HTTPException(status_code=400, detail="Invalid payment signature")
 
-        # 3. Check if user exists
-        user = await db.users.find_one({"id": request.user_id})
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-
-        # 4. Atomic wallet credit using $inc for thread safety
-        await db.users.update_one(
-            {"id": request.user_id},
-            {"$inc": {"wallet_balance": request.amount}}
-        )
-
-        # 5. Get updated user to fetch new balance
-        user = await db.users.find_one({"id": request.user_id})
-        new_balance = user.get("wallet_balance", 0)
-
-        # 6. Mark order as completed
-        await db.payment_orders.update_one(
-            {"order_id": request.razorpay_order_id},
+        # 2. Claim the order: only one request can move it from created to completed
+        order = await db.payment_orders.find_one_and_update(
+            {"order_id": request.razorpay_order_id, "status": "created"},
             {"$set": {
                 "status": "completed",
                 "payment_id": request.razorpay_payment_id,
                 "completed_at": datetime.utcnow()
-            }}
+            }},
+            projection=projection("amount")
         )
+        if not order:
+            existing_order = await db.payment_orders.find_one(
+                {"order_id": request.razorpay_order_id},
+                projection("order_id")
+            )
+            if not existing_order:
+                raise HTTPException(status_code=404, detail="Payment order not found")
+            user = await db.users.find_one({"id": request.user_id}, projection("id", "wallet_balance"))
+            return {
+                "success": True,
+                "message": "Payment already processed",
+                "new_balance": user.get("wallet_balance", 0) if user else 0
+            }
+
+        # 3. Atomic wallet credit returning the new balance; release the order if it fails
+        amount = order.get("amount", request.amount)
+        try:
+            new_balance = await wallet_credit(request.user_id, amount)
+        except Exception:
+            await db.payment_orders.update_one(
+                {"order_id": request.razorpay_order_id},
+                {"$set": {"status": "created"}, "$unset": {"payment_id": "", "completed_at": ""}}
+            )
+            raise
 
-        # 7. Create transaction record
+        # 4. Create transaction record
         transaction = TransactionRecord(
             user_id=request.user_id,
             type="credit",
-            amount=request.amount,
+            amount=amount,
             balance_after=new_balance,
             description="Wallet recharge via Razorpay",
             payment_id=request.razorpay_payment_id,
             order_id=request.razorpay_order_id,
         )
-        await db.transactions.insert_one(transaction.dict())
+        await insert_transaction(transaction, credit_counters(transaction))
 
-        logger.info(f"Payment verified successfully for user {request.user_id}, amount: {request.amount}, new balance: {new_balance}")
+        logger.info(f"Payment verified successfully for user {request.user_id}, amount: {amount}, new balance: {new_balance}")
 
         return {
             "success": True,
@@ -854,7 +1797,7 @@ async def verify_payment(request: VerifyPaymentRequest):
 @api_router.get("/wallet/{user_id}")
 async def get_wallet_balance(user_id: str):
     """Get user's wallet balance"""
-    user = await db.users.find_one({"id": user_id})
+    user = await db.users.find_one({"id": user_id}, projection("id", "wallet_balance"))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -873,17 +1816,7 @@ class ManualBalanceAdd(BaseModel):
 @api_router.post("/wallet/manual-add")
 async def manual_add_balance(request: ManualBalanceAdd):
     """Manually add balance to user's wallet (admin endpoint)"""
-    user = await db.users.find_one({"id": request.user_id})
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    current_balance = user.get("wallet_balance", 0)
-    new_balance = current_balance + request.amount
-    
-    await db.users.update_one(
-        {"id": request.user_id},
-        {"$set": {"wallet_balance": new_balance}}
-    )
+    new_balance = await wallet_credit(request.user_id, request.amount)
     
     # Create transaction record
     transaction = TransactionRecord(
@@ -893,7 +1826,7 @@ async def manual_add_balance(request: ManualBalanceAdd):
         balance_after=new_balance,
         description=request.reason,
     )
-    await db.transactions.insert_one(transaction.dict())
+    await insert_transaction(transaction, credit_counters(transaction))
     
     return {
         "success": True,
@@ -907,37 +1840,28 @@ async def manual_add_balance(request: ManualBalanceAdd):
 async def deduct_from_wallet(request: WalletDeductRequest):
     """Deduct amount from user's wallet for bookings"""
     try:
-        # Get user's current balance
-        user = await db.users.find_one({"id": request.user_id})
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-        
-        current_balance = user.get("wallet_balance", 0)
-        
-        # Check if sufficient balance
-        if current_balance < request.amount:
+        # Debit the wallet only if it covers the amount
+        try:
+            new_balance = await wallet_debit(request.user_id, request.amount)
+        except InsufficientBalanceError as e:
             return {
                 "success": False,
                 "message": "Insufficient balance",
-                "current_balance": current_balance,
+                "current_balance": e.current_balance,
                 "required_amount": request.amount,
-                "shortfall": request.amount - current_balance
+                "shortfall": request.amount - e.current_balance
             }
         
-        new_balance = current_balance - request.amount
-        
-        # Update user's wallet balance
-        await db.users.update_one(
-            {"id": request.user_id},
-            {"$set": {"wallet_balance": new_balance}}
-        )
-        
         # Update booking status to 'paid'
+        counters = {"wallet_balance": -request.amount}
         if request.booking_type == "astrology":
-            await db.bookings.update_one(
+            previous = await db.bookings.find_one_and_update(
                 {"id": request.booking_id},
-                {"$set": {"status": "paid", "paid_at": datetime.utcnow()}}
+                {"$set": {"status": "paid", "paid_at": datetime.utcnow()}},
+                projection=projection("status")
             )
+            if previous:
+                counters.update(booking_status_counters(previous.get("status"), "paid"))
         elif request.booking_type == "yoga_class":
             await db.yoga_bookings.update_one(
                 {"id": request.booking_id},
@@ -957,8 +1881,9 @@ async def deduct_from_wallet(request: WalletDeductRequest):
             balance_after=new_balance,
             description=request.description,
             booking_id=request.booking_id,
+            booking_type=request.booking_type,
         )
-        await db.transactions.insert_one(transaction.dict())
+        await insert_transaction(transaction, counters)
         
         return {
             "success": True,
@@ -975,141 +1900,710 @@ async def deduct_from_wallet(request: WalletDeductRequest):
 
 # Get User Transactions
 @api_router.get("/wallet/{user_id}/transactions")
-async def get_user_transactions(user_id: str, limit: int = 50):
-    """Get user's transaction history"""
+async def get_user_transactions(user_id: str, limit: int = Query(50, ge=1, le=100), cursor: str = None):
+    """Get user's transaction history, newest first, cursor-paginated"""
     transactions = await db.transactions.find(
-        {"user_id": user_id}
-    ).sort("created_at", -1).to_list(limit)
+        cursor_query({"user_id": user_id}, cursor), NO_OBJECT_ID
+    ).sort(KEYSET_SORT).limit(limit).to_list(limit)
     
-    return {"transactions": serialize_doc(transactions)}
+    return json_response({
+        "transactions": transactions,
+        "next_cursor": next_cursor(transactions, limit)
+    })
+
+
+
+# ============= ADMIN ANALYTICS CACHE =============
+
+class TTLCache:
+    """Size-bounded LRU cache with per-entry TTL and single-flight misses.
+
+    Keys are tuples whose first element names the route, so invalidate("route")
+    drops every cached variant of that route. Concurrent misses on the same key
+    share one computation.
+    """
+
+    def __init__(self, ttl: float, maxsize: int):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._inflight = {}  # key -> Task for the computation in progress
+        self._epoch = 0  # bumped by invalidate() with no routes
+        self._generations = {}  # route -> bumped by invalidate(route)
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    async def get_or_compute(self, key, compute):
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        
+        task = self._inflight.get(key)
+        if task:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            # The cache owns the computation, so a caller that goes away (a
+            # closed admin tab) cancels only its own wait, not everyone's
+            task = asyncio.ensure_future(self._compute(key, compute))
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    def _generation(self, route):
+        return self._epoch, self._generations.get(route, 0)
+
+    async def _compute(self, key, compute):
+        generation = self._generation(key[0])
+        try:
+            value = await compute()
+        finally:
+            self._inflight.pop(key, None)
+        
+        # Skip storing results that raced with an invalidation of this route
+        if generation == self._generation(key[0]):
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def invalidate(self, *routes):
+        """Drop cached entries for the given routes, or everything when none are given"""
+        self.invalidations += 1
+        if not routes:
+            self._epoch += 1
+            self._entries.clear()
+            return
+        for route in routes:
+            self._generations[route] = self._generations.get(route, 0) + 1
+        for key in [key for key in self._entries if key[0] in routes]:
+            del self._entries[key]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+        }
 
 
+admin_cache = TTLCache(
+    ttl=float(os.environ.get('ADMIN_CACHE_TTL', '10')),
+    maxsize=int(os.environ.get('ADMIN_CACHE_SIZE', '256')),
+)
 
-# ============= ADMIN DASHBOARD ENDPOINTS =============
+
+# ============= DASHBOARD COUNTERS =============
 
 from typing import Dict, Any
 from datetime import datetime, timedelta
 
-# Admin Stats Dashboard
-@api_router.get("/admin/stats")
-async def get_admin_stats():
-    """Get dashboard statistics for admin"""
+# Running totals behind /admin/stats, kept in a single stats_counters document
+# and maintained with $inc by the write paths. Monthly figures live under
+# months.<YYYY-MM>. rebuild_stats_counters() recomputes everything from the raw
+# collections to detect and repair drift.
+STATS_COUNTERS_ID = "dashboard"
+COUNTED_BOOKING_STATUSES = ("pending", "paid")
+
+
+def month_field(when: datetime, name: str) -> str:
+    """Counter field for `name` in the month containing `when`"""
+    return f"months.{when.strftime('%Y-%m')}.{name}"
+
+
+def credit_counters(transaction) -> dict:
+    """Counter increments for a credit transaction"""
+    return {
+        "wallet_balance": transaction.amount,
+        "revenue_total": transaction.amount,
+        month_field(transaction.created_at, "revenue"): transaction.amount,
+    }
+
+
+def booking_status_counters(old_status, new_status) -> dict:
+    """Counter increments for an astrology booking moving between statuses"""
+    inc = {}
+    if old_status == new_status:
+        return inc
+    if old_status in COUNTED_BOOKING_STATUSES:
+        inc[f"bookings_{old_status}"] = -1
+    if new_status in COUNTED_BOOKING_STATUSES:
+        inc[f"bookings_{new_status}"] = 1
+    return inc
+
+
+async def bump_stats_counters(inc: dict):
+    """Apply counter increments; failures are logged and left for a rebuild to repair"""
+    if not inc:
+        return
     try:
-        # Count users
-        total_users = await db.users.count_documents({})
-        new_users_this_month = await db.users.count_documents({
-            "created_at": {"$gte": datetime.utcnow().replace(day=1)}
-        })
-        
-        # Count bookings
-        total_bookings = await db.bookings.count_documents({})
-        pending_bookings = await db.bookings.count_documents({"status": "pending"})
-        paid_bookings = await db.bookings.count_documents({"status": "paid"})
-        
-        # Count yoga bookings
-        total_yoga_bookings = await db.yoga_bookings.count_documents({})
-        total_yoga_packages = await db.yoga_purchases.count_documents({})
-        total_consultations = await db.yoga_consultations.count_documents({})
-        
-        # Calculate revenue
-        revenue_pipeline = [
-            {
-                "$group": {
-                    "_id": None,
-                    "total_revenue": {"$sum": "$amount"}
-                }
-            }
-        ]
-        credit_transactions = await db.transactions.aggregate([
-            {"$match": {"type": "credit"}},
-            *revenue_pipeline
-        ]).to_list(1)
-        
-        total_revenue = credit_transactions[0]["total_revenue"] if credit_transactions else 0
-        
-        # Revenue this month
-        month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        monthly_revenue = await db.transactions.aggregate([
-            {"$match": {"type": "credit", "created_at": {"$gte": month_start}}},
-            *revenue_pipeline
-        ]).to_list(1)
-        
-        revenue_this_month = monthly_revenue[0]["total_revenue"] if monthly_revenue else 0
-        
-        # Total wallet balance across all users
-        wallet_pipeline = [
-            {
-                "$group": {
-                    "_id": None,
-                    "total_wallet_balance": {"$sum": "$wallet_balance"}
-                }
-            }
-        ]
-        wallet_result = await db.users.aggregate(wallet_pipeline).to_list(1)
-        total_wallet_balance = wallet_result[0]["total_wallet_balance"] if wallet_result else 0
-        
+        await db.stats_counters.update_one(
+            {"_id": STATS_COUNTERS_ID},
+            {"$inc": inc},
+            upsert=True
+        )
+    except Exception as e:
+        logger.error(f"Error updating stats counters {inc}: {str(e)}")
+    admin_cache.invalidate("admin_stats")
+
+
+async def _group_one(collection, pipeline):
+    """Run an aggregation that ends in a single-document $group"""
+    result = await collection.aggregate(pipeline).to_list(1)
+    return result[0] if result else {}
+
+
+async def _group_by_month(collection, pipeline, value):
+    """Sum `value` per YYYY-MM of created_at"""
+    return await collection.aggregate([
+        *pipeline,
+        {"$group": {
+            "_id": {"$dateToString": {"format": "%Y-%m", "date": "$created_at"}},
+            "value": {"$sum": value},
+        }}
+    ]).to_list(None)
+
+
+async def compute_stats_counters() -> dict:
+    """Recompute the stats_counters document from the raw collections"""
+    credit = [{"$match": {"type": "credit"}}]
+    (
+        users, users_monthly, bookings, yoga_classes, yoga_packages,
+        consultations, revenue, revenue_monthly
+    ) = await asyncio.gather(
+        _group_one(db.users, [
+            {"$group": {
+                "_id": None,
+                "total": {"$sum": 1},
+                "wallet_balance": {"$sum": "$wallet_balance"},
+            }}
+        ]),
+        _group_by_month(db.users, [], 1),
+        _group_one(db.bookings, [
+            {"$group": {
+                "_id": None,
+                "total": {"$sum": 1},
+                "pending": count_if({"$eq": ["$status", "pending"]}),
+                "paid": count_if({"$eq": ["$status", "paid"]}),
+            }}
+        ]),
+        db.yoga_bookings.count_documents({}),
+        db.yoga_purchases.count_documents({}),
+        db.yoga_consultations.count_documents({}),
+        _group_one(db.transactions, [
+            *credit,
+            {"$group": {"_id": None, "total": {"$sum": "$amount"}}}
+        ]),
+        _group_by_month(db.transactions, credit, "$amount"),
+    )
+    
+    months = {}
+    for row in users_monthly:
+        if row["_id"]:
+            months.setdefault(row["_id"], {})["new_users"] = row["value"]
+    for row in revenue_monthly:
+        if row["_id"]:
+            months.setdefault(row["_id"], {})["revenue"] = row["value"]
+    
+    return {
+        "users_total": users.get("total", 0),
+        "wallet_balance": users.get("wallet_balance", 0),
+        "bookings_total": bookings.get("total", 0),
+        "bookings_pending": bookings.get("pending", 0),
+        "bookings_paid": bookings.get("paid", 0),
+        "yoga_classes": yoga_classes,
+        "yoga_packages": yoga_packages,
+        "consultations": consultations,
+        "revenue_total": revenue.get("total", 0),
+        "months": months,
+    }
+
+
+def _flatten_counters(counters: dict, prefix: str = "") -> dict:
+    flat = {}
+    for key, value in counters.items():
+        if key == "_id":
+            continue
+        if isinstance(value, dict):
+            flat.update(_flatten_counters(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+async def rebuild_stats_counters(apply: bool = True) -> dict:
+    """Compare stats_counters with the raw collections, replacing it unless apply is False"""
+    actual = await compute_stats_counters()
+    stored = await db.stats_counters.find_one({"_id": STATS_COUNTERS_ID}) or {}
+    
+    stored_flat = _flatten_counters(stored)
+    actual_flat = _flatten_counters(actual)
+    drift = {}
+    for key in sorted(set(stored_flat) | set(actual_flat)):
+        stored_value = stored_flat.get(key, 0)
+        actual_value = actual_flat.get(key, 0)
+        if abs(stored_value - actual_value) > 1e-6:
+            drift[key] = {"stored": stored_value, "actual": actual_value}
+    
+    if apply:
+        await db.stats_counters.replace_one(
+            {"_id": STATS_COUNTERS_ID},
+            {"_id": STATS_COUNTERS_ID, **actual},
+            upsert=True
+        )
+        admin_cache.invalidate("admin_stats")
+    
+    return {"counters": actual, "drift": drift, "applied": apply}
+
+
+# ============= ACTIVITY FEED =============
+
+ACTIVITY_COLLECTIONS = [
+    "users", "bookings", "yoga_bookings", "yoga_purchases", "yoga_consultations", "transactions",
+]
+
+# Booking collections whose status changes are pushed to live subscribers
+BOOKING_COLLECTION_TYPES = {
+    "bookings": "astrology",
+    "yoga_bookings": "yoga_class",
+    "yoga_purchases": "yoga_package",
+    "yoga_consultations": "consultation",
+}
+
+
+def activity_from_doc(collection_name: str, doc: dict) -> dict:
+    """Admin activity entry for a newly inserted document"""
+    if collection_name == "users":
         return {
-            "users": {
-                "total": total_users,
-                "new_this_month": new_users_this_month,
-                "growth_percentage": round((new_users_this_month / max(total_users - new_users_this_month, 1)) * 100, 1)
-            },
-            "bookings": {
-                "total": total_bookings,
-                "pending": pending_bookings,
-                "paid": paid_bookings,
-                "yoga_classes": total_yoga_bookings,
-                "yoga_packages": total_yoga_packages,
-                "consultations": total_consultations
+            "type": "user_signup",
+            "message": f"{doc['full_name']} signed up",
+            "timestamp": doc["created_at"],
+            "user_id": doc["id"]
+        }
+    if collection_name == "transactions":
+        return {
+            "type": "transaction",
+            "message": f"₹{doc['amount']} {doc['type']} - {doc['description']}",
+            "timestamp": doc["created_at"],
+            "transaction_id": doc["id"],
+            "transaction_type": doc["type"],
+            "user_id": doc["user_id"]
+        }
+    if collection_name == "bookings":
+        activity_type, message = "astrology_booking", f"New astrology booking - {doc.get('service_name')}"
+    elif collection_name == "yoga_bookings":
+        activity_type, message = "yoga_class_booking", f"New yoga class booking - {doc.get('class_name')}"
+    elif collection_name == "yoga_purchases":
+        activity_type, message = "yoga_package_purchase", f"New yoga package purchase - {doc.get('package_name')}"
+    else:
+        activity_type, message = "yoga_consultation", f"New yoga consultation - {doc.get('yoga_goal')}"
+    activity = {
+        "type": activity_type,
+        "message": message,
+        "timestamp": doc["created_at"],
+        "booking_id": doc["id"],
+        "user_id": doc["user_id"]
+    }
+    if collection_name == "bookings":
+        activity["astrologer_name"] = doc.get("astrologer_name")
+    return activity
+
+
+def status_change_event(collection_name: str, doc: dict) -> dict:
+    """Live event for a booking whose status was updated"""
+    event = {
+        "type": "booking_status_change",
+        "message": f"Booking {doc['id']} is now {doc.get('status')}",
+        "timestamp": doc.get("updated_at") or doc.get("paid_at") or datetime.utcnow(),
+        "booking_id": doc["id"],
+        "booking_type": BOOKING_COLLECTION_TYPES[collection_name],
+        "status": doc.get("status"),
+        "user_id": doc.get("user_id")
+    }
+    if collection_name == "bookings":
+        event["astrologer_name"] = doc.get("astrologer_name")
+    return event
+
+
+async def load_recent_activities(limit: int) -> list:
+    """Newest `limit` activities across all activity collections, read from the database"""
+    results = await asyncio.gather(*(
+        db[name].find({}, NO_OBJECT_ID).sort("created_at", -1).limit(limit).to_list(limit)
+        for name in ACTIVITY_COLLECTIONS
+    ))
+    activities = [
+        activity_from_doc(name, doc)
+        for name, docs in zip(ACTIVITY_COLLECTIONS, results)
+        for doc in docs
+    ]
+    activities.sort(key=lambda x: x["timestamp"], reverse=True)
+    return activities[:limit]
+
+
+class ActivityFeed:
+    """Bounded, newest-first buffer of admin activity kept current by a change stream.
+
+    The buffer is seeded from the database once the stream is open and then
+    appended to as inserts arrive. The same stream fans events (inserts and
+    booking status changes) out to live subscribers, each with its own bounded
+    queue. Change streams need a replica set; on a standalone mongod the feed
+    stays offline (live and supported are False) and callers fall back to
+    querying the collections.
+    """
+
+    def __init__(self, size: int, subscriber_queue_size: int):
+        self.size = size
+        self.subscriber_queue_size = subscriber_queue_size
+        self.live = False
+        self.supported = True
+        self._buffer = deque(maxlen=size)
+        self._subscribers = {}  # queue -> predicate or None
+        self._task = None
+
+    def recent(self, limit: int) -> list:
+        return list(self._buffer)[:limit]
+
+    def publish(self, activity: dict):
+        # Events inserted between opening the stream and seeding arrive twice
+        if activity not in self._buffer:
+            self._buffer.appendleft(activity)
+            self._fan_out(activity)
+
+    def subscribe(self, predicate=None) -> asyncio.Queue:
+        """Queue receiving every future event (or those matching `predicate`)"""
+        queue = asyncio.Queue(maxsize=self.subscriber_queue_size)
+        self._subscribers[queue] = predicate
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.pop(queue, None)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def _fan_out(self, event: dict):
+        for queue, predicate in list(self._subscribers.items()):
+            if predicate and not predicate(event):
+                continue
+            # A slow client loses its oldest events rather than growing without bound
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    def _handle_change(self, change: dict):
+        collection_name = change["ns"]["coll"]
+        doc = change.get("fullDocument")
+        if doc is None:  # updated document was deleted before the lookup
+            return
+        if change["operationType"] == "insert":
+            self.publish(activity_from_doc(collection_name, doc))
+        else:
+            self._fan_out(status_change_event(collection_name, doc))
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self):
+        pipeline = [{"$match": {"$or": [
+            {"operationType": "insert", "ns.coll": {"$in": ACTIVITY_COLLECTIONS}},
+            {
+                "operationType": "update",
+                "ns.coll": {"$in": list(BOOKING_COLLECTION_TYPES)},
+                "updateDescription.updatedFields.status": {"$exists": True},
             },
-            "revenue": {
-                "total": round(total_revenue, 2),
-                "this_month": round(revenue_this_month, 2),
-                "wallet_balance": round(total_wallet_balance, 2)
-            }
+        ]}}]
+        while True:
+            try:
+                async with db.watch(pipeline, full_document="updateLookup") as stream:
+                    self._buffer.clear()
+                    self._buffer.extend(await load_recent_activities(self.size))
+                    self.live = True
+                    logger.info("Activity feed is live")
+                    async for change in stream:
+                        try:
+                            self._handle_change(change)
+                        except (KeyError, TypeError) as e:
+                            logger.error(f"Skipping malformed activity event: {e!r}")
+            except asyncio.CancelledError:
+                self.live = False
+                raise
+            except OperationFailure as e:
+                self.live = False
+                if e.code == 40573:  # change streams are only supported on replica sets
+                    self.supported = False
+                    logger.warning("Change streams unavailable; recent activity will be queried on demand")
+                    return
+                logger.error(f"Activity feed stream failed: {str(e)}")
+            except PyMongoError as e:
+                self.live = False
+                logger.error(f"Activity feed stream failed: {str(e)}")
+            await asyncio.sleep(5)
+
+
+activity_feed = ActivityFeed(
+    int(os.environ.get('ACTIVITY_BUFFER_SIZE', '200')),
+    int(os.environ.get('EVENT_QUEUE_SIZE', '100')),
+)
+
+EVENT_SUBSCRIBERS = Gauge("event_stream_subscribers", "Connected Server-Sent Events clients")
+EVENT_SUBSCRIBERS.set_function(lambda: activity_feed.subscriber_count)
+
+# Comment line sent to idle event streams so proxies keep the connection open
+EVENT_KEEPALIVE_SECONDS = 15
+
+
+def event_stream_response(predicate=None) -> StreamingResponse:
+    """Server-Sent Events response relaying activity_feed events"""
+    if not activity_feed.supported:
+        raise HTTPException(status_code=503, detail="Live events require a MongoDB replica set")
+    
+    async def events():
+        # Subscribe only once the body is being sent: an iterator that is never
+        # started never runs its finally, and its queue would be fanned out to forever
+        queue = activity_feed.subscribe(predicate)
+        try:
+            yield ": connected\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), EVENT_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+        finally:
+            activity_feed.unsubscribe(queue)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# ============= ADMIN DASHBOARD ENDPOINTS =============
+
+# Admin Stats Dashboard
+ADMIN_STATS_TIMEOUT = float(os.environ.get('ADMIN_STATS_TIMEOUT', '5'))
+
+
+def _admin_stats_sections():
+    """Per-collection stats queries for the admin dashboard, keyed by collection name"""
+    month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    return {
+        "users": _group_one(db.users, [
+            {"$group": {
+                "_id": None,
+                "total": {"$sum": 1},
+                "new_this_month": count_if({"$gte": ["$created_at", month_start]}),
+                "wallet_balance": {"$sum": "$wallet_balance"},
+            }}
+        ]),
+        "bookings": _group_one(db.bookings, [
+            {"$group": {
+                "_id": None,
+                "total": {"$sum": 1},
+                "pending": count_if({"$eq": ["$status", "pending"]}),
+                "paid": count_if({"$eq": ["$status", "paid"]}),
+            }}
+        ]),
+        "yoga_bookings": db.yoga_bookings.count_documents({}),
+        "yoga_purchases": db.yoga_purchases.count_documents({}),
+        "yoga_consultations": db.yoga_consultations.count_documents({}),
+        "transactions": _group_one(db.transactions, [
+            {"$match": {"type": "credit"}},
+            {"$group": {
+                "_id": None,
+                "total_revenue": {"$sum": "$amount"},
+                "this_month": {"$sum": {"$cond": [
+                    {"$gte": ["$created_at", month_start]}, "$amount", 0
+                ]}},
+            }}
+        ]),
+    }
+
+
+async def _admin_stats_live():
+    """Dashboard figures computed from the raw collections"""
+    # One query per collection, all in flight at once
+    sections = _admin_stats_sections()
+    results = await asyncio.gather(
+        *(asyncio.wait_for(query, ADMIN_STATS_TIMEOUT) for query in sections.values()),
+        return_exceptions=True
+    )
+    
+    # A failing collection only blanks its own figures
+    data = {}
+    errors = {}
+    for name, result in zip(sections, results):
+        if isinstance(result, BaseException):
+            logger.error(f"Error fetching admin stats for {name}: {result!r}")
+            errors[name] = "timeout" if isinstance(result, asyncio.TimeoutError) else str(result)
+            data[name] = None
+        else:
+            data[name] = result
+    
+    users = data["users"]
+    bookings = data["bookings"]
+    transactions = data["transactions"]
+    
+    total_users = users.get("total", 0) if users is not None else None
+    new_users_this_month = users.get("new_this_month", 0) if users is not None else None
+    if users is not None:
+        growth_percentage = round((new_users_this_month / max(total_users - new_users_this_month, 1)) * 100, 1)
+    else:
+        growth_percentage = None
+    
+    response = {
+        "users": {
+            "total": total_users,
+            "new_this_month": new_users_this_month,
+            "growth_percentage": growth_percentage
+        },
+        "bookings": {
+            "total": bookings.get("total", 0) if bookings is not None else None,
+            "pending": bookings.get("pending", 0) if bookings is not None else None,
+            "paid": bookings.get("paid", 0) if bookings is not None else None,
+            "yoga_classes": data["yoga_bookings"],
+            "yoga_packages": data["yoga_purchases"],
+            "consultations": data["yoga_consultations"]
+        },
+        "revenue": {
+            "total": round(transactions.get("total_revenue", 0), 2) if transactions is not None else None,
+            "this_month": round(transactions.get("this_month", 0), 2) if transactions is not None else None,
+            "wallet_balance": round(users.get("wallet_balance", 0), 2) if users is not None else None
         }
+    }
+    if errors:
+        response["errors"] = errors
+    return response
+
+
+async def _admin_stats_from_counters():
+    """Dashboard figures read from the stats_counters document"""
+    counters = await db.stats_counters.find_one({"_id": STATS_COUNTERS_ID})
+    if not counters:
+        counters = (await rebuild_stats_counters())["counters"]
+    
+    this_month = counters.get("months", {}).get(datetime.utcnow().strftime("%Y-%m"), {})
+    total_users = counters.get("users_total", 0)
+    new_users_this_month = this_month.get("new_users", 0)
+    
+    return {
+        "users": {
+            "total": total_users,
+            "new_this_month": new_users_this_month,
+            "growth_percentage": round((new_users_this_month / max(total_users - new_users_this_month, 1)) * 100, 1)
+        },
+        "bookings": {
+            "total": counters.get("bookings_total", 0),
+            "pending": counters.get("bookings_pending", 0),
+            "paid": counters.get("bookings_paid", 0),
+            "yoga_classes": counters.get("yoga_classes", 0),
+            "yoga_packages": counters.get("yoga_packages", 0),
+            "consultations": counters.get("consultations", 0)
+        },
+        "revenue": {
+            "total": round(counters.get("revenue_total", 0), 2),
+            "this_month": round(this_month.get("revenue", 0), 2),
+            "wallet_balance": round(counters.get("wallet_balance", 0), 2)
+        }
+    }
+
+
+@api_router.get("/admin/stats")
+async def get_admin_stats(live: bool = False):
+    """Get dashboard statistics for admin (live=true recomputes from the raw collections)"""
+    try:
+        if live:
+            allow_collection_scan()
+            return await admin_cache.get_or_compute(("admin_stats", "live"), _admin_stats_live)
+        return await admin_cache.get_or_compute(("admin_stats", "counters"), _admin_stats_from_counters)
     except Exception as e:
         logger.error(f"Error fetching admin stats: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Reconcile Dashboard Counters (Admin)
+@api_router.post("/admin/stats/rebuild")
+async def rebuild_admin_stats(dry_run: bool = False):
+    """Recompute stats_counters from the raw collections and report any drift"""
+    try:
+        allow_collection_scan()
+        return await rebuild_stats_counters(apply=not dry_run)
+    except Exception as e:
+        logger.error(f"Error rebuilding stats counters: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# Admin Cache Statistics
+@api_router.get("/admin/cache-stats")
+async def get_admin_cache_stats():
+    """Hit/miss counters for the admin analytics cache"""
+    return admin_cache.stats()
+
+
 # Get All Users (Admin)
 @api_router.get("/admin/users")
 async def get_all_users(
-    skip: int = 0,
-    limit: int = 50,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
     search: str = None,
     sort_by: str = "created_at",
-    order: str = "desc"
+    order: str = "desc",
+    cursor: str = None
 ):
-    """Get all users with pagination and search"""
+    """Get all users with pagination and search (skip, or cursor when sorting by created_at)"""
     try:
-        query = {}
-        if search:
-            query["$or"] = [
-                {"full_name": {"$regex": search, "$options": "i"}},
-                {"email": {"$regex": search, "$options": "i"}},
-                {"phone": {"$regex": search, "$options": "i"}}
-            ]
+        query = user_search_query(search) if search else {}
+        if not query:
+            allow_collection_scan()  # the unfiltered total counts every user
         
         sort_order = -1 if order == "desc" else 1
+        if sort_by == "created_at":
+            sort = [("created_at", sort_order), ("id", sort_order)]
+        elif cursor:
+            raise HTTPException(status_code=400, detail="Cursor pagination requires sort_by=created_at")
+        else:
+            sort = [(sort_by, sort_order)]
         
-        users = await db.users.find(query).sort(sort_by, sort_order).skip(skip).limit(limit).to_list(limit)
+        users = await db.users.find(
+            cursor_query(query, cursor, descending=sort_order == -1),
+            {**NO_OBJECT_ID, "password_hash": 0, **{field: 0 for field in USER_SEARCH_FIELDS}}
+        ).sort(sort).skip(skip).limit(limit).to_list(limit)
         total = await db.users.count_documents(query)
         
-        # Convert ObjectId and remove password hashes
-        users_serialized = []
-        for user in users:
-            user = serialize_doc(user)
-            user.pop("password_hash", None)
-            users_serialized.append(user)
-        
-        return {
-            "users": users_serialized,
+        return json_response({
+            "users": users,
             "total": total,
             "page": skip // limit + 1,
-            "pages": (total + limit - 1) // limit
-        }
+            "pages": (total + limit - 1) // limit,
+            "next_cursor": next_cursor(users, limit) if sort_by == "created_at" else None
+        })
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching users: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1118,13 +2612,17 @@ async def get_all_users(
 # Get All Bookings (Admin)
 @api_router.get("/admin/bookings")
 async def get_all_bookings(
-    skip: int = 0,
-    limit: int = 50,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
     status: str = None,
-    booking_type: str = None  # 'astrology', 'yoga_class', 'yoga_package', 'consultation'
+    booking_type: str = None,  # 'astrology', 'yoga_class', 'yoga_package', 'consultation'
+    cursor: str = None
 ):
-    """Get all bookings across all types"""
+    """Get all bookings across all types (cursor pagination needs a booking_type)"""
     try:
+        if cursor and not booking_type:
+            raise HTTPException(status_code=400, detail="Cursor pagination requires booking_type")
+        
         result = {
             "astrology_bookings": [],
             "yoga_class_bookings": [],
@@ -1132,74 +2630,246 @@ async def get_all_bookings(
             "yoga_consultations": []
         }
         
+        query = {}
+        if status:
+            query["status"] = status
+        query = cursor_query(query, cursor)
+        page = []
+        
         # Astrology bookings
         if not booking_type or booking_type == "astrology":
-            query = {}
-            if status:
-                query["status"] = status
-            astrology = await db.bookings.find(query).sort("created_at", -1).skip(skip).limit(limit).to_list(limit)
-            result["astrology_bookings"] = serialize_doc(astrology)
+            page = await db.bookings.find(query, NO_OBJECT_ID).sort(KEYSET_SORT).skip(skip).limit(limit).to_list(limit)
+            result["astrology_bookings"] = page
         
         # Yoga class bookings
         if not booking_type or booking_type == "yoga_class":
-            query = {}
-            if status:
-                query["status"] = status
-            yoga_classes = await db.yoga_bookings.find(query).sort("created_at", -1).skip(skip).limit(limit).to_list(limit)
-            result["yoga_class_bookings"] = serialize_doc(yoga_classes)
+            page = await db.yoga_bookings.find(query, NO_OBJECT_ID).sort(KEYSET_SORT).skip(skip).limit(limit).to_list(limit)
+            result["yoga_class_bookings"] = page
         
         # Yoga package purchases
         if not booking_type or booking_type == "yoga_package":
-            query = {}
-            if status:
-                query["status"] = status
-            yoga_packages = await db.yoga_purchases.find(query).sort("created_at", -1).skip(skip).limit(limit).to_list(limit)
-            result["yoga_package_purchases"] = serialize_doc(yoga_packages)
+            page = await db.yoga_purchases.find(query, NO_OBJECT_ID).sort(KEYSET_SORT).skip(skip).limit(limit).to_list(limit)
+            result["yoga_package_purchases"] = page
         
         # Yoga consultations
         if not booking_type or booking_type == "consultation":
-            query = {}
-            if status:
-                query["status"] = status
-            consultations = await db.yoga_consultations.find(query).sort("created_at", -1).skip(skip).limit(limit).to_list(limit)
-            result["yoga_consultations"] = serialize_doc(consultations)
+            page = await db.yoga_consultations.find(query, NO_OBJECT_ID).sort(KEYSET_SORT).skip(skip).limit(limit).to_list(limit)
+            result["yoga_consultations"] = page
+        
+        if booking_type:
+            result["next_cursor"] = next_cursor(page, limit)
         
-        return result
+        return json_response(result)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching bookings: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Merged Bookings Feed (Admin)
+ADMIN_BOOKING_FEED_SOURCES = [
+    ("bookings", "astrology", None),
+    ("yoga_bookings", "yoga_class", None),
+    ("yoga_purchases", "yoga_package", None),
+    ("yoga_consultations", "consultation", None),
+]
+
+@api_router.get("/admin/bookings/feed")
+async def get_bookings_feed(
+    limit: int = Query(50, ge=1, le=100),
+    status: str = None,
+    booking_type: str = None,  # 'astrology', 'yoga_class', 'yoga_package', 'consultation'
+    cursor: str = None
+):
+    """Get bookings of every type as one newest-first, cursor-paginated feed"""
+    try:
+        sources = [
+            source for source in ADMIN_BOOKING_FEED_SOURCES
+            if not booking_type or source[1] == booking_type
+        ]
+        if not sources:
+            raise HTTPException(status_code=400, detail="Invalid booking_type")
+        
+        query = {}
+        if status:
+            query["status"] = status
+        
+        bookings, next_page = await union_page(sources, cursor_query(query, cursor), limit, "booking_type")
+        
+        return json_response({
+            "bookings": bookings,
+            "next_cursor": next_page
+        })
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching bookings feed: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # Get All Transactions (Admin)
 @api_router.get("/admin/transactions")
 async def get_all_transactions(
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
     transaction_type: str = None,  # 'credit' or 'debit'
-    user_id: str = None
+    user_id: str = None,
+    cursor: str = None
 ):
-    """Get all transactions with filters"""
+    """Get all transactions with filters (skip or cursor pagination)"""
     try:
         query = {}
         if transaction_type:
             query["type"] = transaction_type
         if user_id:
             query["user_id"] = user_id
+        if not query:
+            allow_collection_scan()  # the unfiltered total counts every transaction
         
-        transactions = await db.transactions.find(query).sort("created_at", -1).skip(skip).limit(limit).to_list(limit)
+        transactions = await db.transactions.find(
+            cursor_query(query, cursor), NO_OBJECT_ID
+        ).sort(KEYSET_SORT).skip(skip).limit(limit).to_list(limit)
         total = await db.transactions.count_documents(query)
         
-        return {
-            "transactions": serialize_doc(transactions),
+        return json_response({
+            "transactions": transactions,
             "total": total,
             "page": skip // limit + 1,
-            "pages": (total + limit - 1) // limit
-        }
+            "pages": (total + limit - 1) // limit,
+            "next_cursor": next_cursor(transactions, limit)
+        })
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching transactions: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Streaming Exports (Admin)
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', '1000'))
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+USER_EXPORT_FIELDS = list(UserResponse.model_fields)
+BOOKING_EXPORT_FIELDS = {
+    "astrology": list(BookingResponse.model_fields),
+    "yoga_class": list(YogaClassBookingResponse.model_fields),
+    "yoga_package": list(YogaPackagePurchaseResponse.model_fields),
+    "consultation": list(YogaConsultationResponse.model_fields),
+}
+TRANSACTION_EXPORT_FIELDS = list(TransactionRecord.model_fields)
+
+
+def _csv_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def export_response(name: str, fmt: str, fields: list, cursors: list) -> StreamingResponse:
+    """Stream documents from `cursors` as NDJSON or CSV.
+
+    `cursors` is a list of (cursor, extra) pairs; `extra` is merged into every
+    document of that cursor. Output is flushed in ~64KB chunks, so memory stays
+    flat however many documents are exported.
+    """
+    if fmt not in ("ndjson", "csv"):
+        raise HTTPException(status_code=400, detail="format must be ndjson or csv")
+    
+    async def ndjson_rows():
+        chunk = bytearray()
+        for cursor, extra in cursors:
+            async for doc in cursor:
+                chunk += orjson.dumps({**doc, **extra}, default=str)
+                chunk += b"\n"
+                if len(chunk) >= EXPORT_CHUNK_BYTES:
+                    yield bytes(chunk)
+                    chunk.clear()
+        if chunk:
+            yield bytes(chunk)
+    
+    async def csv_rows():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        for cursor, extra in cursors:
+            async for doc in cursor:
+                doc.update(extra)
+                writer.writerow([_csv_value(doc.get(field)) for field in fields])
+                if buffer.tell() >= EXPORT_CHUNK_BYTES:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+        yield buffer.getvalue()
+    
+    if fmt == "csv":
+        body, media_type = csv_rows(), "text/csv"
+    else:
+        body, media_type = ndjson_rows(), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'}
+    )
+
+
+@api_router.get("/admin/export/users")
+async def export_users(format: str = "ndjson", search: str = None):
+    """Stream every user matching the /admin/users filters"""
+    allow_collection_scan()
+    query = user_search_query(search) if search else {}
+    cursor = db.users.find(query, projection(*USER_EXPORT_FIELDS)).batch_size(EXPORT_BATCH_SIZE)
+    return export_response("users", format, USER_EXPORT_FIELDS, [(cursor, {})])
+
+
+@api_router.get("/admin/export/bookings")
+async def export_bookings(format: str = "ndjson", status: str = None, booking_type: str = None):
+    """Stream every booking matching the /admin/bookings filters, tagged with booking_type"""
+    allow_collection_scan()
+    sources = [
+        source for source in ADMIN_BOOKING_FEED_SOURCES
+        if not booking_type or source[1] == booking_type
+    ]
+    if not sources:
+        raise HTTPException(status_code=400, detail="Invalid booking_type")
+    
+    query = {}
+    if status:
+        query["status"] = status
+    
+    fields = ["booking_type"]
+    for _, source_type, _ in sources:
+        fields += [field for field in BOOKING_EXPORT_FIELDS[source_type] if field not in fields]
+    
+    cursors = [
+        (
+            db[collection_name].find(
+                query, projection(*BOOKING_EXPORT_FIELDS[source_type])
+            ).batch_size(EXPORT_BATCH_SIZE),
+            {"booking_type": source_type}
+        )
+        for collection_name, source_type, _ in sources
+    ]
+    return export_response("bookings", format, fields, cursors)
+
+
+@api_router.get("/admin/export/transactions")
+async def export_transactions(
+    format: str = "ndjson",
+    transaction_type: str = None,  # 'credit' or 'debit'
+    user_id: str = None
+):
+    """Stream every transaction matching the /admin/transactions filters"""
+    allow_collection_scan()
+    query = {}
+    if transaction_type:
+        query["type"] = transaction_type
+    if user_id:
+        query["user_id"] = user_id
+    cursor = db.transactions.find(
+        query, projection(*TRANSACTION_EXPORT_FIELDS)
+    ).batch_size(EXPORT_BATCH_SIZE)
+    return export_response("transactions", format, TRANSACTION_EXPORT_FIELDS, [(cursor, {})])
+
+
 # Update Booking Status (Admin)
 class UpdateBookingStatus(BaseModel):
     status: str  # 'pending', 'paid', 'completed', 'cancelled'
@@ -1221,18 +2891,23 @@ async def update_booking_status(
         
         collection = collection_map.get(booking_type, db.bookings)
         
-        result = await collection.update_one(
+        changes = {
+            "status": status_data.status,
+            "updated_at": datetime.utcnow()
+        }
+        previous = await collection.find_one_and_update(
             {"id": booking_id},
-            {"$set": {
-                "status": status_data.status,
-                "updated_at": datetime.utcnow()
-            }}
+            {"$set": changes}
         )
         
-        if result.modified_count == 0:
+        if not previous:
             raise HTTPException(status_code=404, detail="Booking not found")
         
-        updated_booking = await collection.find_one({"id": booking_id})
+        # Motor hands out a new collection object per attribute access, so compare by name
+        if collection.name == "bookings":
+            await bump_stats_counters(booking_status_counters(previous.get("status"), status_data.status))
+        
+        updated_booking = {**previous, **changes}
         
         return {
             "success": True,
@@ -1249,125 +2924,143 @@ async def update_booking_status(
 async def get_recent_activity(limit: int = 20):
     """Get recent activity across all types"""
     try:
-        activities = []
-        
-        # Recent user signups
-        recent_users = await db.users.find().sort("created_at", -1).limit(5).to_list(5)
-        for user in recent_users:
-            activities.append({
-                "type": "user_signup",
-                "message": f"{user['full_name']} signed up",
-                "timestamp": user["created_at"],
-                "user_id": user["id"]
-            })
-        
-        # Recent bookings
-        recent_bookings = await db.bookings.find().sort("created_at", -1).limit(5).to_list(5)
-        for booking in recent_bookings:
-            activities.append({
-                "type": "astrology_booking",
-                "message": f"New astrology booking - {booking['service_name']}",
-                "timestamp": booking["created_at"],
-                "booking_id": booking["id"],
-                "user_id": booking["user_id"]
-            })
-        
-        # Recent transactions
-        recent_transactions = await db.transactions.find().sort("created_at", -1).limit(5).to_list(5)
-        for txn in recent_transactions:
-            activities.append({
-                "type": "transaction",
-                "message": f"₹{txn['amount']} {txn['type']} - {txn['description']}",
-                "timestamp": txn["created_at"],
-                "user_id": txn["user_id"]
-            })
-        
-        # Sort all activities by timestamp
-        activities.sort(key=lambda x: x["timestamp"], reverse=True)
-        
-        return {"activities": activities[:limit]}
+        if activity_feed.live:
+            return {"activities": activity_feed.recent(limit)}
+        return await admin_cache.get_or_compute(
+            ("recent_activity", limit), lambda: _compute_recent_activity(limit)
+        )
     except Exception as e:
         logger.error(f"Error fetching recent activity: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _compute_recent_activity(limit: int):
+    return {"activities": await load_recent_activities(limit)}
+
+
+# Live Events (Admin)
+@api_router.get("/admin/events")
+async def stream_admin_events():
+    """Server-Sent Events stream of signups, bookings, status changes and wallet transactions"""
+    return event_stream_response()
+
+
 # Revenue Analytics (Admin)
+async def _compute_revenue_analytics(days: int):
+    start_day = (datetime.utcnow() - timedelta(days=days)).strftime("%Y-%m-%d")
+    
+    # Daily revenue, from at most one rollup per day and category
+    daily_revenue = await db.revenue_daily.aggregate([
+        {
+            "$match": {
+                "type": "credit",
+                "day": {"$gte": start_day}
+            }
+        },
+        {
+            "$group": {
+                "_id": "$day",
+                "revenue": {"$sum": "$revenue"},
+                "count": {"$sum": "$count"}
+            }
+        },
+        {
+            "$sort": {"_id": 1}
+        }
+    ]).to_list(None)
+    
+    # Revenue by booking type
+    booking_revenue = await db.revenue_daily.aggregate([
+        {
+            "$match": {
+                "type": "debit",
+                "day": {"$gte": start_day}
+            }
+        },
+        {
+            "$group": {
+                "_id": "$category",
+                "revenue": {"$sum": "$revenue"},
+                "count": {"$sum": "$count"}
+            }
+        }
+    ]).to_list(None)
+    
+    return {
+        "daily_revenue": daily_revenue,
+        "booking_revenue": booking_revenue,
+        "period_days": days
+    }
+
+
 @api_router.get("/admin/revenue-analytics")
 async def get_revenue_analytics(days: int = 30):
     """Get revenue analytics for the past N days"""
     try:
-        start_date = datetime.utcnow() - timedelta(days=days)
-        
-        # Daily revenue
-        daily_revenue = await db.transactions.aggregate([
-            {
-                "$match": {
-                    "type": "credit",
-                    "created_at": {"$gte": start_date}
-                }
-            },
-            {
-                "$group": {
-                    "_id": {
-                        "$dateToString": {
-                            "format": "%Y-%m-%d",
-                            "date": "$created_at"
-                        }
-                    },
-                    "revenue": {"$sum": "$amount"},
-                    "count": {"$sum": 1}
-                }
-            },
-            {
-                "$sort": {"_id": 1}
-            }
-        ]).to_list(days)
-        
-        # Revenue by booking type
-        booking_revenue = await db.transactions.aggregate([
-            {
-                "$match": {
-                    "type": "debit",
-                    "created_at": {"$gte": start_date}
-                }
-            },
-            {
-                "$group": {
-                    "_id": "$description",
-                    "revenue": {"$sum": "$amount"},
-                    "count": {"$sum": 1}
-                }
-            }
-        ]).to_list(100)
-        
-        return {
-            "daily_revenue": daily_revenue,
-            "booking_revenue": booking_revenue,
-            "period_days": days
-        }
+        return await admin_cache.get_or_compute(
+            ("revenue_analytics", days), lambda: _compute_revenue_analytics(days)
+        )
     except Exception as e:
         logger.error(f"Error fetching revenue analytics: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@api_router.post("/admin/revenue-analytics/rebuild")
+async def rebuild_revenue_analytics():
+    """Recompute the revenue_daily rollups from all transactions"""
+    try:
+        buckets = await backfill_revenue_daily()
+        return {"success": True, "buckets": buckets}
+    except Exception as e:
+        logger.error(f"Error rebuilding revenue rollups: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # Delete User (Admin)
 @api_router.delete("/admin/users/{user_id}")
 async def delete_user(user_id: str):
     """Delete a user and all their data"""
     try:
         # Delete user
-        result = await db.users.delete_one({"id": user_id})
-        if result.deleted_count == 0:
+        user = await db.users.find_one_and_delete(
+            {"id": user_id}, projection=projection("created_at", "wallet_balance")
+        )
+        if not user:
             raise HTTPException(status_code=404, detail="User not found")
-        
-        # Delete user's bookings
-        await db.bookings.delete_many({"user_id": user_id})
-        await db.yoga_bookings.delete_many({"user_id": user_id})
-        await db.yoga_purchases.delete_many({"user_id": user_id})
-        await db.yoga_consultations.delete_many({"user_id": user_id})
-        
-        # Delete user's transactions
+        counters = {"users_total": -1, "wallet_balance": -user.get("wallet_balance", 0)}
+        if user.get("created_at"):
+            counters[month_field(user["created_at"], "new_users")] = -1
+        
+        # Delete user's bookings, taking what was deleted off the counters
+        bookings_deleted = 0
+        for status in COUNTED_BOOKING_STATUSES:
+            result = await db.bookings.delete_many({"user_id": user_id, "status": status})
+            counters[f"bookings_{status}"] = -result.deleted_count
+            bookings_deleted += result.deleted_count
+        result = await db.bookings.delete_many({"user_id": user_id})
+        counters["bookings_total"] = -(bookings_deleted + result.deleted_count)
+        for collection_name, counter in (
+            ("yoga_bookings", "yoga_classes"),
+            ("yoga_purchases", "yoga_packages"),
+            ("yoga_consultations", "consultations"),
+        ):
+            result = await db[collection_name].delete_many({"user_id": user_id})
+            counters[counter] = -result.deleted_count
+        
+        # Delete user's transactions; they leave the revenue counters and rollups.
+        # The user is already gone, so no new transactions can land in between.
+        credits_by_month = await _group_by_month(
+            db.transactions, [{"$match": {"user_id": user_id, "type": "credit"}}], "$amount"
+        )
+        await subtract_revenue_daily({"user_id": user_id})
         await db.transactions.delete_many({"user_id": user_id})
+        for row in credits_by_month:
+            counters["revenue_total"] = counters.get("revenue_total", 0) - row["value"]
+            if row["_id"]:
+                counters[f"months.{row['_id']}.revenue"] = -row["value"]
+        
+        await bump_stats_counters({field: value for field, value in counters.items() if value})
+        admin_cache.invalidate()
         
         return {
             "success": True,
@@ -1390,29 +3083,18 @@ class AdminWalletUpdate(BaseModel):
 async def admin_update_wallet(user_id: str, wallet_data: AdminWalletUpdate):
     """Admin endpoint to add or deduct wallet balance"""
     try:
-        user = await db.users.find_one({"id": user_id})
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-        
-        current_balance = user.get("wallet_balance", 0)
-        
         if wallet_data.action == "add":
-            new_balance = current_balance + wallet_data.amount
+            new_balance = await wallet_credit(user_id, wallet_data.amount)
             transaction_type = "credit"
         elif wallet_data.action == "deduct":
-            if current_balance < wallet_data.amount:
+            try:
+                new_balance = await wallet_debit(user_id, wallet_data.amount)
+            except InsufficientBalanceError:
                 raise HTTPException(status_code=400, detail="Insufficient balance")
-            new_balance = current_balance - wallet_data.amount
             transaction_type = "debit"
         else:
             raise HTTPException(status_code=400, detail="Invalid action")
         
-        # Update wallet
-        await db.users.update_one(
-            {"id": user_id},
-            {"$set": {"wallet_balance": new_balance}}
-        )
-        
         # Create transaction
         transaction = TransactionRecord(
             user_id=user_id,
@@ -1421,7 +3103,11 @@ async def admin_update_wallet(user_id: str, wallet_data: AdminWalletUpdate):
             balance_after=new_balance,
             description=f"Admin: {wallet_data.reason}",
         )
-        await db.transactions.insert_one(transaction.dict())
+        if transaction_type == "credit":
+            counters = credit_counters(transaction)
+        else:
+            counters = {"wallet_balance": -wallet_data.amount}
+        await insert_transaction(transaction, counters)
         
         return {
             "success": True,
@@ -1438,20 +3124,28 @@ async def admin_update_wallet(user_id: str, wallet_data: AdminWalletUpdate):
 # ============= ASTROLOGER DASHBOARD ENDPOINTS =============
 
 @api_router.get("/astrologers/bookings")
-async def get_astrologer_bookings(name: str):
-    """Get all bookings for a specific astrologer by name"""
+async def get_astrologer_bookings(name: str, limit: int = Query(200, ge=1, le=200), cursor: str = None):
+    """Get bookings for a specific astrologer by name, newest first, cursor-paginated"""
     try:
         if not name or name == "undefined":
             raise HTTPException(status_code=400, detail="Astrologer name is required")
         
-        # Find all bookings for this astrologer
-        bookings = await db.bookings.find({"astrologer_name": name}).sort("created_at", -1).to_list(200)
+        # One page of bookings for this astrologer
+        query = cursor_query({"astrologer_name": name}, cursor)
+        bookings = await db.bookings.find(query, NO_OBJECT_ID).sort(KEYSET_SORT).limit(limit).to_list(limit)
+        
+        # Fetch the users behind this page in a single round trip
+        user_ids = list({booking["user_id"] for booking in bookings})
+        users = await db.users.find(
+            {"id": {"$in": user_ids}},
+            projection("id", "full_name", "email", "phone")
+        ).to_list(len(user_ids))
+        users_by_id = {user["id"]: user for user in users}
         
-        # Fetch user details for each booking
         enriched_bookings = []
         for booking in bookings:
-            user = await db.users.find_one({"id": booking["user_id"]})
-            enriched_booking = serialize_doc(booking)
+            user = users_by_id.get(booking["user_id"])
+            enriched_booking = booking
             if user:
                 enriched_booking["user_name"] = user.get("full_name", "Unknown")
                 enriched_booking["user_email"] = user.get("email", "")
@@ -1466,7 +3160,10 @@ async def get_astrologer_bookings(name: str):
             
             enriched_bookings.append(enriched_booking)
         
-        return {"bookings": enriched_bookings}
+        return json_response({
+            "bookings": enriched_bookings,
+            "next_cursor": next_cursor(bookings, limit)
+        })
     except HTTPException:
         raise
     except Exception as e:
@@ -1481,30 +3178,45 @@ async def get_astrologer_stats(name: str):
         if not name or name == "undefined":
             raise HTTPException(status_code=400, detail="Astrologer name is required")
         
-        # Get all bookings for this astrologer
-        all_bookings = await db.bookings.find({"astrologer_name": name}).to_list(1000)
-        
-        # Calculate stats
-        total_bookings = len(all_bookings)
-        completed_bookings = len([b for b in all_bookings if b.get("status") == "completed"])
-        pending_bookings = len([b for b in all_bookings if b.get("status") == "pending"])
-        cancelled_bookings = len([b for b in all_bookings if b.get("status") == "cancelled"])
-        
-        # Calculate earnings
-        total_earnings = sum(b.get("service_price", 0) for b in all_bookings if b.get("status") in ["paid", "completed"])
-        
-        # This month earnings
         month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        this_month_bookings = [b for b in all_bookings if b.get("created_at", datetime.min) >= month_start]
-        this_month_earnings = sum(b.get("service_price", 0) for b in this_month_bookings if b.get("status") in ["paid", "completed"])
-        
-        # This week bookings
         week_start = datetime.utcnow() - timedelta(days=7)
-        this_week_bookings = len([b for b in all_bookings if b.get("created_at", datetime.min) >= week_start])
+        earned = {"$in": ["$status", ["paid", "completed"]]}
+        
+        # Compute every figure server-side in one pass over this astrologer's bookings
+        stats_pipeline = [
+            {"$match": {"astrologer_name": name}},
+            {
+                "$group": {
+                    "_id": None,
+                    "total_bookings": {"$sum": 1},
+                    "completed_bookings": count_if({"$eq": ["$status", "completed"]}),
+                    "pending_bookings": count_if({"$eq": ["$status", "pending"]}),
+                    "cancelled_bookings": count_if({"$eq": ["$status", "cancelled"]}),
+                    "total_earnings": {"$sum": {"$cond": [earned, "$service_price", 0]}},
+                    "this_month_earnings": {"$sum": {"$cond": [
+                        {"$and": [earned, {"$gte": ["$created_at", month_start]}]},
+                        "$service_price",
+                        0
+                    ]}},
+                    "this_week_bookings": count_if({"$gte": ["$created_at", week_start]}),
+                }
+            }
+        ]
+        
+        # Get astrologer profile for rating and reviews alongside the stats
+        stats_result, astrologer = await asyncio.gather(
+            db.bookings.aggregate(stats_pipeline).to_list(1),
+            db.astrologers.find_one({"name": name}, projection("rating", "reviews")),
+        )
+        stats = stats_result[0] if stats_result else {}
         
-        # Get astrologer profile for rating and reviews
-        from bson.objectid import ObjectId
-        astrologer = await db.astrologers.find_one({"name": name})
+        total_bookings = stats.get("total_bookings", 0)
+        completed_bookings = stats.get("completed_bookings", 0)
+        pending_bookings = stats.get("pending_bookings", 0)
+        cancelled_bookings = stats.get("cancelled_bookings", 0)
+        total_earnings = stats.get("total_earnings", 0)
+        this_month_earnings = stats.get("this_month_earnings", 0)
+        this_week_bookings = stats.get("this_week_bookings", 0)
         
         average_rating = astrologer.get("rating", 0) if astrologer else 0
         total_reviews = astrologer.get("reviews", 0) if astrologer else 0
@@ -1527,6 +3239,14 @@ async def get_astrologer_stats(name: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@api_router.get("/astrologers/events")
+async def stream_astrologer_events(name: str):
+    """Server-Sent Events stream of new bookings and status changes for one astrologer"""
+    if not name or name == "undefined":
+        raise HTTPException(status_code=400, detail="Astrologer name is required")
+    return event_stream_response(lambda event: event.get("astrologer_name") == name)
+
+
 @api_router.put("/astrologers/bookings/{booking_id}/status")
 async def update_astrologer_booking_status(
     booking_id: str,
@@ -1534,18 +3254,21 @@ async def update_astrologer_booking_status(
 ):
     """Update booking status from astrologer dashboard"""
     try:
-        result = await db.bookings.update_one(
+        changes = {
+            "status": status_data.status,
+            "updated_at": datetime.utcnow()
+        }
+        previous = await db.bookings.find_one_and_update(
             {"id": booking_id},
-            {"$set": {
-                "status": status_data.status,
-                "updated_at": datetime.utcnow()
-            }}
+            {"$set": changes}
         )
         
-        if result.modified_count == 0:
+        if not previous:
             raise HTTPException(status_code=404, detail="Booking not found")
         
-        updated_booking = await db.bookings.find_one({"id": booking_id})
+        await bump_stats_counters(booking_status_counters(previous.get("status"), status_data.status))
+        
+        updated_booking = {**previous, **changes}
         
         return {
             "success": True,
@@ -1562,6 +3285,63 @@ async def update_astrologer_booking_status(
 # Include the router in the main app
 app.include_router(api_router)
 
+
+class RequestTrackingMiddleware:
+    """Request latency metrics and the FAIL_ON_COLLSCAN guard, as one pure ASGI layer.
+
+    The recorded status is the one actually sent, including the guard's 500.
+    A COLLSCAN can only fail the request while the response has not started,
+    so queries run by a streaming body after its first chunk are not guarded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        in_progress = REQUESTS_IN_PROGRESS.labels(scope["method"])
+        in_progress.inc()
+        started = time.perf_counter()
+        context = QueryContext(scope)
+        current_query_context.set(context)
+        status = 500
+        replaced = False
+
+        async def send_checked(message):
+            nonlocal status, replaced
+            if replaced:
+                return
+            if message["type"] == "http.response.start":
+                if context.collscans:
+                    replaced = True
+                    await ORJSONResponse(
+                        {"detail": "Query performed a collection scan", "queries": context.collscans},
+                        status_code=500
+                    )(scope, receive, send)
+                    return
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_checked)
+        finally:
+            # Label by route template, not raw path, to keep cardinality bounded
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                scope["method"], route.path if route else "unmatched", str(status)
+            ).observe(time.perf_counter() - started)
+            in_progress.dec()
+
+
+app.add_middleware(RequestTrackingMiddleware)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -1570,6 +3350,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def create_db_indexes():
+    await ensure_indexes()
+
+@app.on_event("startup")
+async def start_activity_feed():
+    activity_feed.start()
+
+@app.on_event("shutdown")
+async def stop_activity_feed():
+    await activity_feed.stop()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()
+    slow_query_log.close()
+
+@app.on_event("shutdown")
+async def shutdown_payment_gateway():
+    await payment_gateway.close()
+
+@app.on_event("shutdown")
+async def shutdown_password_hash_pool():
+    password_hash_pool.shutdown(wait=False)
@@ -0,0 +1,81 @@
+"""Fixtures for tests that run against a local mongod.
+
+Set MONGO_URL to run them; every test module is skipped otherwise. They use
+the database named by TEST_DB_NAME (default yoga_app_test), which is dropped
+before each test, never the DB_NAME the app is configured with.
+"""
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ["DB_NAME"] = os.environ.get("TEST_DB_NAME", "yoga_app_test")
+# Hashing cost does not matter here and the tests create many accounts
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+if os.environ.get("MONGO_URL"):
+    from pymongo import monitoring
+
+    class CommandRecorder(monitoring.CommandListener):
+        """Keeps every command the app's client sends while `recording` is set"""
+
+        def __init__(self):
+            self.recording = False
+            self.commands = []  # (database, command name, command)
+
+        def started(self, event):
+            if self.recording:
+                self.commands.append((event.database_name, event.command_name, dict(event.command)))
+
+        def succeeded(self, event):
+            pass
+
+        def failed(self, event):
+            pass
+
+    # Global listeners only apply to clients created afterwards, so this has
+    # to happen before server.py creates its client
+    command_recorder = CommandRecorder()
+    monitoring.register(command_recorder)
+
+
+@pytest.fixture(scope="session")
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture(scope="session")
+def run(loop):
+    """Run a coroutine on the session loop the Motor client is bound to"""
+    return loop.run_until_complete
+
+
+@pytest.fixture(scope="session")
+def server(run):
+    import server
+
+    yield server
+    server.client.close()
+
+
+@pytest.fixture
+def db(server, run):
+    """An empty test database with every index in place"""
+    run(server.client.drop_database(server.db.name))
+    run(server.ensure_indexes())
+    server.admin_cache.invalidate()
+    return server.db
+
+
+@pytest.fixture
+def recorder():
+    command_recorder.commands.clear()
+    command_recorder.recording = True
+    yield command_recorder
+    command_recorder.recording = False
@@ -0,0 +1,65 @@
+"""Exports stream: exporting a large collection must not grow the process's memory with it.
+
+EXPORT_TEST_ROWS sets how many transactions are seeded (default 1,000,000).
+"""
+import gc
+import os
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+if not os.environ.get("MONGO_URL"):
+    pytest.skip("MONGO_URL is not set; these tests need a local mongod", allow_module_level=True)
+if not os.path.exists("/proc/self/statm"):
+    pytest.skip("reading resident memory needs /proc", allow_module_level=True)
+
+EXPORT_TEST_ROWS = int(os.environ.get("EXPORT_TEST_ROWS", 1_000_000))
+RSS_CEILING_BYTES = 64 * 2 ** 20
+SEED_BATCH_SIZE = 10_000
+
+
+def resident_bytes() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+async def seed_transactions(db, count: int):
+    started = datetime.utcnow() - timedelta(days=365)
+    for offset in range(0, count, SEED_BATCH_SIZE):
+        await db.transactions.insert_many([{
+            "id": str(uuid.uuid4()),
+            "user_id": f"export-user-{i % 1000}",
+            "type": "credit" if i % 3 else "debit",
+            "amount": float(100 + i % 900),
+            "balance_after": 5000.0,
+            "description": "Export test transaction",
+            "status": "completed",
+            "created_at": started + timedelta(seconds=i),
+        } for i in range(offset, min(offset + SEED_BATCH_SIZE, count))], ordered=False)
+
+
+async def consume(response) -> tuple:
+    """Drain a StreamingResponse; returns (lines, peak resident bytes seen while draining)"""
+    lines = 0
+    peak = resident_bytes()
+    async for chunk in response.body_iterator:
+        lines += chunk.count(b"\n" if isinstance(chunk, bytes) else "\n")
+        peak = max(peak, resident_bytes())
+    return lines, peak
+
+
+@pytest.mark.parametrize("fmt, header_lines", [("ndjson", 0), ("csv", 1)])
+def test_export_memory_stays_flat(server, db, run, fmt, header_lines):
+    run(seed_transactions(db, EXPORT_TEST_ROWS))
+    gc.collect()
+    baseline = resident_bytes()
+
+    response = run(server.export_transactions(format=fmt, transaction_type=None, user_id=None))
+    lines, peak = run(consume(response))
+
+    assert lines == EXPORT_TEST_ROWS + header_lines
+    growth = peak - baseline
+    assert growth < RSS_CEILING_BYTES, (
+        f"{fmt} export of {EXPORT_TEST_ROWS} rows grew RSS by {growth / 2 ** 20:.1f}MB"
+    )
@@ -0,0 +1,178 @@
+"""Every query the routes issue must be served by an index (no COLLSCAN).
+
+The routes are called directly against a few seeded documents while the
+conftest command recorder captures what they send. Each distinct query shape
+is then explained and its winning plans checked.
+"""
+import os
+from datetime import datetime
+
+import pytest
+
+if not os.environ.get("MONGO_URL"):
+    pytest.skip("MONGO_URL is not set; these tests need a local mongod", allow_module_level=True)
+
+import orjson
+from pymongo import MongoClient
+
+from razorpay_stub import sign_payment
+
+ASTROLOGER = "Pandit Test Sharma"
+
+
+def body(response):
+    return orjson.loads(response.body)
+
+
+async def exercise_routes(server):
+    """Seed a little of everything through the routes, then call every read path"""
+    users = []
+    for i in range(3):
+        user = await server.signup(server.UserCreate(
+            full_name=f"Index Test {i}",
+            email=f"index{i}@example.com",
+            phone=f"+9190000000{i:02d}",
+            password="secret-password",
+        ))
+        users.append(user.id)
+    user_id = users[0]
+    await server.login(server.UserLogin(email="index0@example.com", password="secret-password"))
+    await server.get_user(user_id)
+    await server.admin_signup(server.AdminCreate(
+        fullName=ASTROLOGER, email="astro@example.com", password="secret-password", role="astrologer"
+    ))
+    await server.admin_login(server.AdminLogin(email="astro@example.com", password="secret-password"))
+    await server.db.astrologers.insert_one({"name": ASTROLOGER, "rating": 4.8, "reviews": 12})
+
+    # Wallet top-up through the payment flow, then a duplicate verify
+    await server.manual_add_balance(server.ManualBalanceAdd(user_id=user_id, amount=5000))
+    await server.db.payment_orders.insert_one({
+        "order_id": "order_indextest", "user_id": user_id, "amount": 1000.0,
+        "amount_paise": 100000, "currency": "INR", "purpose": "wallet_recharge",
+        "status": "created", "created_at": datetime.utcnow(),
+    })
+    verify = server.VerifyPaymentRequest(
+        user_id=user_id,
+        razorpay_order_id="order_indextest",
+        razorpay_payment_id="pay_indextest",
+        razorpay_signature=sign_payment(server.razorpay_key_secret, "order_indextest", "pay_indextest"),
+        amount=1000.0,
+    )
+    await server.verify_payment(verify)
+    await server.verify_payment(verify)
+
+    bookings = []
+    for i in range(2):
+        booking = await server.create_booking(server.BookingCreate(
+            user_id=user_id, astrologer_id="astro-1", astrologer_name=ASTROLOGER,
+            astrologer_expertise="Vedic", astrologer_experience="10 years",
+            astrologer_languages="Hindi", service_name="Kundli Reading", service_duration="30 min",
+            service_price=499.0, booking_date="2026-11-01", booking_time="10:00",
+        ))
+        bookings.append(booking.id)
+    yoga_class = await server.create_yoga_class_booking(server.YogaClassBookingCreate(
+        user_id=user_id, class_name="Hatha Flow", class_time="07:00", class_date="2026-11-02",
+        guru_name="Guru Anand", price=299.0, credits=1, level="Beginner",
+    ))
+    package = await server.create_yoga_package_purchase(server.YogaPackagePurchaseCreate(
+        user_id=user_id, package_name="Starter Pack", price=1499.0, credits=5,
+        validity="30 days", session_type="Group class",
+    ))
+    await server.create_yoga_consultation(server.YogaConsultationCreate(
+        user_id=user_id, yoga_goal="Flexibility", intensity_preference="Gentle",
+        connection_method="Video call", schedule_timing="Weekday mornings",
+    ))
+
+    for booking_id, booking_type, amount in [
+        (bookings[0], "astrology", 499.0), (yoga_class.id, "yoga_class", 299.0), (package.id, "yoga_package", 1499.0),
+    ]:
+        await server.deduct_from_wallet(server.WalletDeductRequest(
+            user_id=user_id, amount=amount, booking_id=booking_id,
+            booking_type=booking_type, description="Index test",
+        ))
+    await server.admin_update_wallet(users[1], server.AdminWalletUpdate(amount=100, action="add", reason="test"))
+    await server.update_booking_status(bookings[1], server.UpdateBookingStatus(status="completed"), "astrology")
+    await server.update_booking_status(yoga_class.id, server.UpdateBookingStatus(status="completed"), "yoga_class")
+    await server.update_astrologer_booking_status(bookings[1], server.UpdateBookingStatus(status="cancelled"))
+
+    # User read paths, following cursors so the keyset shapes are covered too
+    await server.get_user_bookings(user_id)
+    await server.get_booking(bookings[0])
+    await server.get_user_yoga_bookings(user_id)
+    page = body(await server.get_user_yoga_timeline(user_id, limit=1, cursor=None))
+    await server.get_user_yoga_timeline(user_id, limit=1, cursor=page["next_cursor"])
+    await server.get_wallet_balance(user_id)
+    page = body(await server.get_user_transactions(user_id, limit=1, cursor=None))
+    await server.get_user_transactions(user_id, limit=1, cursor=page["next_cursor"])
+
+    # Admin read paths (unfiltered totals are whole-collection counts by design)
+    await server.get_admin_stats(live=False)
+    page = body(await server.get_all_users(skip=0, limit=1, search="index", sort_by="created_at", order="desc", cursor=None))
+    await server.get_all_users(skip=0, limit=1, search="index", sort_by="created_at", order="desc", cursor=page["next_cursor"])
+    await server.get_all_users(skip=0, limit=1, search="+919000", sort_by="created_at", order="desc", cursor=None)
+    await server.get_all_bookings(skip=0, limit=10, status="pending", booking_type=None, cursor=None)
+    page = body(await server.get_all_bookings(skip=0, limit=1, status=None, booking_type="astrology", cursor=None))
+    await server.get_all_bookings(skip=0, limit=1, status=None, booking_type="astrology", cursor=page["next_cursor"])
+    page = body(await server.get_bookings_feed(limit=1, status=None, booking_type=None, cursor=None))
+    await server.get_bookings_feed(limit=1, status="pending", booking_type=None, cursor=page["next_cursor"])
+    await server.get_all_transactions(skip=0, limit=1, transaction_type="credit", user_id=None, cursor=None)
+    page = body(await server.get_all_transactions(skip=0, limit=1, transaction_type=None, user_id=user_id, cursor=None))
+    await server.get_all_transactions(skip=0, limit=1, transaction_type=None, user_id=user_id, cursor=page["next_cursor"])
+    await server.get_recent_activity(limit=20)
+    await server.get_revenue_analytics(days=30)
+
+    # Astrologer dashboard
+    page = body(await server.get_astrologer_bookings(ASTROLOGER, limit=1, cursor=None))
+    await server.get_astrologer_bookings(ASTROLOGER, limit=1, cursor=page["next_cursor"])
+    await server.get_astrologer_stats(ASTROLOGER)
+
+
+def winning_plans(explain) -> list:
+    """Every winningPlan in an explain document, including those of $unionWith sub-pipelines"""
+    plans = []
+    if isinstance(explain, dict):
+        for key, value in explain.items():
+            if key == "winningPlan":
+                plans.append(value)
+            else:
+                plans.extend(winning_plans(value))
+    elif isinstance(explain, list):
+        for item in explain:
+            plans.extend(winning_plans(item))
+    return plans
+
+
+def test_route_queries_use_indexes(server, db, run, recorder):
+    run(exercise_routes(server))
+    recorder.recording = False
+
+    shapes = {}
+    for database, command_name, command in recorder.commands:
+        if command_name not in server.EXPLAINABLE_COMMANDS:
+            continue
+        if any("$merge" in stage or "$out" in stage for stage in command.get("pipeline", [])):
+            continue
+        statements = server.EXPLAIN_SINGLE_STATEMENT.get(command_name)
+        if statements and len(command.get(statements, ())) != 1:
+            continue  # explain() rejects multi-statement writes
+        command = {key: value for key, value in command.items() if key not in server.EXPLAIN_IGNORED_FIELDS}
+        shape = {
+            "command": command_name,
+            "collection": server.command_collection(command_name, command),
+            **{part: server.redact(command[part]) for part in server.EXPLAINABLE_COMMANDS[command_name] if part in command},
+        }
+        shapes.setdefault(orjson.dumps(shape, option=orjson.OPT_SORT_KEYS).decode(), (database, command))
+    assert shapes, "no queries were recorded"
+
+    client = MongoClient(os.environ["MONGO_URL"])
+    try:
+        scans = []
+        for shape, (database, command) in shapes.items():
+            explain = client[database].command({"explain": command, "verbosity": "queryPlanner"})
+            plans = winning_plans(explain)
+            assert plans, f"no plan in explain output for {shape}"
+            if "COLLSCAN" in server.plan_stages(plans):
+                scans.append(shape)
+    finally:
+        client.close()
+    assert not scans, "queries without a supporting index:\n" + "\n".join(scans)
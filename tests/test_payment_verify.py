@@ -0,0 +1,79 @@
+"""verify_payment must credit a wallet exactly once per order, however many retries race."""
+import asyncio
+import os
+from datetime import datetime
+
+import pytest
+
+if not os.environ.get("MONGO_URL"):
+    pytest.skip("MONGO_URL is not set; these tests need a local mongod", allow_module_level=True)
+
+from razorpay_stub import sign_payment
+
+DUPLICATE_VERIFIES = 50
+
+
+async def create_order(db, order_id: str, user_id: str, amount: float):
+    await db.payment_orders.insert_one({
+        "order_id": order_id,
+        "user_id": user_id,
+        "amount": amount,
+        "amount_paise": int(amount * 100),
+        "currency": "INR",
+        "purpose": "wallet_recharge",
+        "status": "created",
+        "created_at": datetime.utcnow(),
+    })
+
+
+def verify_request(server, user_id: str, order_id: str, payment_id: str, amount: float):
+    return server.VerifyPaymentRequest(
+        user_id=user_id,
+        razorpay_order_id=order_id,
+        razorpay_payment_id=payment_id,
+        razorpay_signature=sign_payment(server.razorpay_key_secret, order_id, payment_id),
+        amount=amount,
+    )
+
+
+def test_concurrent_verifies_credit_once(server, db, run):
+    run(db.users.insert_one({"id": "verify-user", "full_name": "Verify Test", "wallet_balance": 0.0}))
+    run(create_order(db, "order_storm", "verify-user", 1000.0))
+    request = verify_request(server, "verify-user", "order_storm", "pay_storm", 1000.0)
+
+    results = run(asyncio.gather(*(server.verify_payment(request) for _ in range(DUPLICATE_VERIFIES))))
+
+    assert all(result["success"] for result in results)
+    assert sum(1 for result in results if "transaction_id" in result) == 1
+    user = run(db.users.find_one({"id": "verify-user"}))
+    assert user["wallet_balance"] == 1000.0
+    assert run(db.transactions.count_documents({"order_id": "order_storm"})) == 1
+    order = run(db.payment_orders.find_one({"order_id": "order_storm"}))
+    assert order["status"] == "completed"
+    assert order["payment_id"] == "pay_storm"
+
+
+def test_failed_credit_releases_the_order(server, db, run):
+    # No such user, so wallet_credit fails after the order has been claimed
+    run(create_order(db, "order_orphan", "missing-user", 500.0))
+    request = verify_request(server, "missing-user", "order_orphan", "pay_orphan", 500.0)
+
+    with pytest.raises(server.HTTPException):
+        run(server.verify_payment(request))
+
+    order = run(db.payment_orders.find_one({"order_id": "order_orphan"}))
+    assert order["status"] == "created"
+    assert "payment_id" not in order
+    assert run(db.transactions.count_documents({"order_id": "order_orphan"})) == 0
+
+
+def test_invalid_signature_is_rejected(server, db, run):
+    run(db.users.insert_one({"id": "verify-user", "full_name": "Verify Test", "wallet_balance": 0.0}))
+    run(create_order(db, "order_forged", "verify-user", 1000.0))
+    request = verify_request(server, "verify-user", "order_forged", "pay_forged", 1000.0)
+    request.razorpay_signature = "0" * 64
+
+    with pytest.raises(server.HTTPException) as error:
+        run(server.verify_payment(request))
+    assert error.value.status_code == 400
+    assert run(db.payment_orders.find_one({"order_id": "order_forged"}))["status"] == "created"
@@ -0,0 +1,70 @@
+"""Incremental stats_counters updates must match a recount of the raw collections."""
+import os
+
+import pytest
+
+if not os.environ.get("MONGO_URL"):
+    pytest.skip("MONGO_URL is not set; these tests need a local mongod", allow_module_level=True)
+
+
+async def create_booking(server, user_id: str, price: float):
+    return await server.create_booking(server.BookingCreate(
+        user_id=user_id, astrologer_id="astro-1", astrologer_name="Pandit Counter",
+        astrologer_expertise="Vedic", astrologer_experience="10 years",
+        astrologer_languages="Hindi", service_name="Kundli Reading", service_duration="30 min",
+        service_price=price, booking_date="2026-11-01", booking_time="10:00",
+    ))
+
+
+async def exercise_counted_writes(server):
+    users = []
+    for i in range(2):
+        user = await server.signup(server.UserCreate(
+            full_name=f"Counter Test {i}",
+            email=f"counter{i}@example.com",
+            phone=f"+9191000000{i:02d}",
+            password="secret-password",
+        ))
+        users.append(user.id)
+        await server.manual_add_balance(server.ManualBalanceAdd(user_id=user.id, amount=2000))
+    keep, drop = users
+
+    # Admin status changes on astrology bookings, including pending -> paid
+    first = await create_booking(server, keep, 499.0)
+    second = await create_booking(server, keep, 199.0)
+    await server.update_booking_status(first.id, server.UpdateBookingStatus(status="paid"), "astrology")
+    await server.update_booking_status(second.id, server.UpdateBookingStatus(status="completed"), "astrology")
+    await server.update_astrologer_booking_status(first.id, server.UpdateBookingStatus(status="cancelled"))
+
+    # A wallet debit that pays for a booking, and admin wallet changes
+    third = await create_booking(server, keep, 799.0)
+    await server.deduct_from_wallet(server.WalletDeductRequest(
+        user_id=keep, amount=799.0, booking_id=third.id, booking_type="astrology", description="Counter test",
+    ))
+    await server.admin_update_wallet(keep, server.AdminWalletUpdate(amount=100, action="deduct", reason="test"))
+    await server.admin_update_wallet(drop, server.AdminWalletUpdate(amount=50, action="add", reason="test"))
+
+    # A deleted user with bookings of every kind and transactions
+    await create_booking(server, drop, 199.0)
+    await server.create_yoga_class_booking(server.YogaClassBookingCreate(
+        user_id=drop, class_name="Hatha Flow", class_time="07:00", class_date="2026-11-02",
+        guru_name="Guru Anand", price=299.0, credits=1, level="Beginner",
+    ))
+    await server.create_yoga_package_purchase(server.YogaPackagePurchaseCreate(
+        user_id=drop, package_name="Starter Pack", price=1499.0, credits=5,
+        validity="30 days", session_type="Group class",
+    ))
+    await server.create_yoga_consultation(server.YogaConsultationCreate(
+        user_id=drop, yoga_goal="Flexibility", intensity_preference="Gentle",
+        connection_method="Video call", schedule_timing="Weekday mornings",
+    ))
+    await server.delete_user(drop)
+
+
+def test_counters_match_a_recount(server, db, run):
+    run(exercise_counted_writes(server))
+
+    result = run(server.rebuild_stats_counters(apply=False))
+
+    assert result["drift"] == {}
+    assert result["counters"]["bookings_paid"] == 1
@@ -0,0 +1,61 @@
+"""Concurrency stress tests for the atomic wallet service (wallet_debit / wallet_credit)."""
+import asyncio
+import os
+
+import pytest
+
+if not os.environ.get("MONGO_URL"):
+    pytest.skip("MONGO_URL is not set; these tests need a local mongod", allow_module_level=True)
+
+PARALLEL_OPERATIONS = 1000
+
+
+async def create_wallet(db, user_id: str, balance: float):
+    await db.users.insert_one({"id": user_id, "full_name": "Wallet Test", "wallet_balance": balance})
+
+
+async def attempt_debit(server, user_id: str, amount: float):
+    try:
+        return await server.wallet_debit(user_id, amount)
+    except server.InsufficientBalanceError:
+        return None
+
+
+def test_parallel_debits_never_lose_updates_or_overdraw(server, db, run):
+    run(create_wallet(db, "wallet-debits", 500.0))
+
+    results = run(asyncio.gather(*(
+        attempt_debit(server, "wallet-debits", 1.0) for _ in range(PARALLEL_OPERATIONS)
+    )))
+
+    balances = [balance for balance in results if balance is not None]
+    # Exactly the affordable debits succeed, each seeing a distinct balance
+    assert len(balances) == 500
+    assert sorted(balances) == [float(balance) for balance in range(500)]
+    assert min(balances) >= 0
+    user = run(db.users.find_one({"id": "wallet-debits"}))
+    assert user["wallet_balance"] == 0
+
+
+def test_parallel_credits_and_debits_balance_out(server, db, run):
+    run(create_wallet(db, "wallet-mixed", 100.0))
+
+    async def operation(i):
+        if i % 2:
+            return "credit", await server.wallet_credit("wallet-mixed", 3.0)
+        return "debit", await attempt_debit(server, "wallet-mixed", 5.0)
+
+    results = run(asyncio.gather(*(operation(i) for i in range(PARALLEL_OPERATIONS))))
+
+    credits = sum(1 for kind, _ in results if kind == "credit")
+    debits = sum(1 for kind, balance in results if kind == "debit" and balance is not None)
+    assert all(balance >= 0 for _, balance in results if balance is not None)
+    user = run(db.users.find_one({"id": "wallet-mixed"}))
+    assert user["wallet_balance"] == 100.0 + 3.0 * credits - 5.0 * debits
+    assert user["wallet_balance"] >= 0
+
+
+def test_debit_unknown_user_is_not_found(server, db, run):
+    with pytest.raises(server.HTTPException) as error:
+        run(server.wallet_debit("no-such-user", 1.0))
+    assert error.value.status_code == 404